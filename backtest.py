@@ -8,24 +8,310 @@ Usage:
     python backtest.py                    # Run with defaults
     python backtest.py --days 7           # Last 7 days
     python backtest.py --threshold 0.03   # Min edge threshold
+    python backtest.py --sweep --threshold-grid 0.02 0.03 0.05 --days-grid 1 3
+                                          # Grid of backtests across all cores
+    python backtest.py --no-cache         # Always refetch klines from Binance
+    python backtest.py --no-save-trades   # Summary only in backtest_results.json
 """
 
 import argparse
+import csv
+import hashlib
+import itertools
 import json
 import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 from datetime import datetime, timezone, timedelta
 
 import config
 from data_feeds import BTCFeed
-from btc_strategy import BTCStrategy
-from risk_manager import RiskManager
+from btc_strategy import _estimate_probability_jit
+from jit import HAS_NUMBA, njit, prange
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger("polly.backtest")
 
+# orjson is much faster for large trade dumps; stdlib json works too
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Simulated target offsets around the window's starting price
+_OFFSETS = np.array([-0.001, 0.0, 0.001])
+
+KLINES_CACHE_DIR = os.path.join(config.LOG_DIR, "klines_cache")
+
+# Column layout of the per-trade record array (one row per simulated trade)
+TRADE_DTYPE = np.dtype([
+    ("time_idx", np.int64),
+    ("price", np.float64),
+    ("target", np.float64),
+    ("direction", "U5"),
+    ("our_prob", np.float64),
+    ("market_prob", np.float64),
+    ("edge", np.float64),
+    ("kelly", np.float64),
+    ("bet_size", np.float64),
+    ("won", np.bool_),
+    ("pnl", np.float64),
+    ("bankroll", np.float64),
+    ("rsi", np.float64),
+])
+
+
+# ═══════════════════════════════════════════════════════════════
+#  Compiled simulation kernel
+# ═══════════════════════════════════════════════════════════════
+
+@njit(cache=True)
+def _rsi_streaming(closes, period):
+    """
+    Wilder's RSI for every candle in one left-to-right pass: the same
+    recurrence as btc_strategy._rsi_wilder, emitting the value after each
+    delta. Candles without `period` deltas read 50.
+    """
+    n = len(closes)
+    out = np.full(n, 50.0, np.float32)
+    if n <= period:
+        return out
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for k in range(1, n):
+        delta = np.float64(closes[k]) - np.float64(closes[k - 1])
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if k <= period:
+            # Seed: plain average of the first `period` deltas
+            avg_gain += gain
+            avg_loss += loss
+            if k < period:
+                continue
+            avg_gain /= period
+            avg_loss /= period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss == 0:
+            out[k] = 100.0
+        else:
+            out[k] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+@njit(cache=True)
+def _vwap_streaming(highs, lows, closes, volumes, window):
+    """
+    VWAP over the trailing `window` candles for every candle in one pass,
+    keeping running sum(tp * vol) and sum(vol). Candles without a full
+    window (or with zero volume) read their own close.
+    """
+    n = len(closes)
+    out = np.empty(n, np.float32)
+    tpv_sum = 0.0
+    vol_sum = 0.0
+    for k in range(n):
+        tp = (np.float64(highs[k]) + lows[k] + closes[k]) / 3.0
+        vol = np.float64(volumes[k])
+        tpv_sum += tp * vol
+        vol_sum += vol
+        if k >= window:
+            j = k - window
+            tp_old = (np.float64(highs[j]) + lows[j] + closes[j]) / 3.0
+            vol_old = np.float64(volumes[j])
+            tpv_sum -= tp_old * vol_old
+            vol_sum -= vol_old
+        if k >= window - 1 and vol_sum > 0:
+            out[k] = tpv_sum / vol_sum
+        else:
+            out[k] = closes[k]
+    return out
+
+
+@njit(cache=True)
+def _kelly_nb(our_prob, market_prob, fraction):
+    """RiskManager.kelly_size on plain floats."""
+    if market_prob <= 0 or market_prob >= 1 or our_prob <= 0 or our_prob >= 1:
+        return 0.0
+    b = (1.0 / market_prob) - 1.0
+    if b <= 0:
+        return 0.0
+    kelly_full = (our_prob * b - (1.0 - our_prob)) / b
+    if kelly_full <= 0:
+        return 0.0
+    return kelly_full * fraction
+
+
+@njit(cache=True)
+def _max_possible_edge(rsi, vwap_dev, momentum, min_market_prob,
+                       rsi_oversold, rsi_overbought):
+    """
+    Upper bound on our_prob - market_prob over every offset in a window.
+
+    Every backtest market sits on the far side of (or at) the current
+    price, so the estimator's base probability is at most 0.5; the
+    indicator adjustments can move it by at most the sum of their
+    magnitudes, whichever direction the market faces.
+    """
+    adj_bound = 0.0
+    if rsi < rsi_oversold:
+        adj_bound += 0.05 * (rsi_oversold - rsi) / rsi_oversold
+    elif rsi > rsi_overbought:
+        adj_bound += 0.05 * (rsi - rsi_overbought) / (100 - rsi_overbought)
+    if abs(vwap_dev) > 0.001:
+        adj_bound += abs(vwap_dev) * 0.5
+    adj_bound += abs(momentum) * 10
+    return min(0.5 + adj_bound, 0.98) - min_market_prob
+
+
+@njit(cache=True, parallel=True)
+def _score_windows(closes, rsi_arr, vwap_arr, vol_arr, mom_arr, noise,
+                   offsets, lookback, window_size, kelly_frac, min_edge,
+                   rsi_oversold, rsi_overbought):
+    """
+    Phase 1: score every (window, offset) pair independently.
+
+    Nothing here depends on the bankroll, so windows run in parallel.
+    Returns (n_windows, n_offsets) tables of our/market probability, edge,
+    Kelly fraction, whether a taken bet wins, and its payout per $1.
+    Windows where no offset can reach min_edge are left unscored
+    (NaN our_prob, zero edge and Kelly), and offsets below min_edge skip
+    Kelly sizing (zero Kelly), so phase 2 rejects both.
+    """
+    n_windows = noise.shape[0]
+    n_offsets = len(offsets)
+    directions = offsets >= 0  # True = "above" market
+    our_probs = np.empty((n_windows, n_offsets))
+    market_probs = np.empty((n_windows, n_offsets))
+    edges = np.empty((n_windows, n_offsets))
+    kellys = np.empty((n_windows, n_offsets))
+    won = np.empty((n_windows, n_offsets), np.bool_)
+    payout_mult = np.empty((n_windows, n_offsets))
+
+    for w in prange(n_windows):
+        i = lookback + w * window_size
+        # Everything that doesn't depend on the offset is read once per
+        # window, widened to float64 so the scoring math is full precision
+        current_price = np.float64(closes[i])
+        end_price = np.float64(closes[i + window_size - 1])
+        rsi = np.float64(rsi_arr[i])
+        volatility = np.float64(vol_arr[i])
+        momentum = np.float64(mom_arr[i])
+        vwap = np.float64(vwap_arr[i])
+        vwap_dev = (current_price - vwap) / vwap if vwap > 0 else 0.0
+
+        # Simulated market: ~efficient (0.5) with some noise
+        for o in range(n_offsets):
+            market_probs[w, o] = min(max(0.5 + np.float64(noise[w, o]), 0.1), 0.9)
+
+        # A trade needs our_prob - market_prob >= min_edge (Kelly is zero
+        # otherwise), so skip the estimator when even the bound falls short
+        bound = _max_possible_edge(rsi, vwap_dev, momentum,
+                                   market_probs[w].min(), rsi_oversold,
+                                   rsi_overbought)
+        if bound + 1e-12 < min_edge:
+            for o in range(n_offsets):
+                our_probs[w, o] = np.nan
+                edges[w, o] = 0.0
+                kellys[w, o] = 0.0
+                won[w, o] = False
+                payout_mult[w, o] = 0.0
+            continue
+
+        # Outcome of every offset's market in one shot: YES resolves when
+        # the close lands on the market's side of its target
+        targets = current_price * (1.0 + offsets)
+        outcomes_yes = (end_price > targets) == directions
+
+        for o in range(n_offsets):
+            is_above = directions[o]
+            our_prob = _estimate_probability_jit(
+                current_price, targets[o], is_above, rsi, vwap_dev,
+                volatility, momentum, 0.0, rsi_oversold, rsi_overbought,
+            )
+            market_prob = market_probs[w, o]
+            edge = our_prob - market_prob
+
+            our_probs[w, o] = our_prob
+            edges[w, o] = edge
+
+            # Cheapest rejection first: Kelly is zero unless our_prob beats
+            # market_prob, so an edge below min_edge can never be traded
+            if edge < min_edge:
+                kellys[w, o] = 0.0
+                won[w, o] = False
+                payout_mult[w, o] = 0.0
+                continue
+
+            bet_on_yes = edge > 0
+
+            kellys[w, o] = _kelly_nb(our_prob, market_prob, kelly_frac)
+            won[w, o] = bet_on_yes == outcomes_yes[o]
+            if bet_on_yes:
+                payout_mult[w, o] = 1 / market_prob - 1
+            else:
+                payout_mult[w, o] = 1 / (1 - market_prob) - 1
+
+    return our_probs, market_probs, edges, kellys, won, payout_mult
+
+
+@njit(cache=True)
+def _simulate_trades(edges, kellys, won, payout_mult, min_edge, max_bet_pct,
+                     min_bet, initial_bankroll):
+    """
+    Phase 2: walk the scored table in time order, sizing each bet against
+    the current bankroll. Sequential because every trade moves the bankroll.
+    Returns window/offset indices, bet sizes, PnLs and running bankroll per
+    trade, plus the final bankroll.
+    """
+    n_windows, n_offsets = edges.shape
+    max_trades = n_windows * n_offsets
+    window_idx = np.empty(max_trades, np.int64)
+    offset_idx = np.empty(max_trades, np.int64)
+    bet_sizes = np.empty(max_trades)
+    pnls = np.empty(max_trades)
+    bankrolls = np.empty(max_trades)
+
+    n_trades = 0
+    bankroll = initial_bankroll
+    for w in range(n_windows):
+        for o in range(n_offsets):
+            if abs(edges[w, o]) < min_edge:
+                continue
+            kelly_f = kellys[w, o]
+            if kelly_f <= 0:
+                continue
+
+            bet_size = min(bankroll * kelly_f, bankroll * max_bet_pct)
+            if bet_size < min_bet:
+                continue
+
+            if won[w, o]:
+                pnl = bet_size * payout_mult[w, o]
+            else:
+                pnl = -bet_size
+            bankroll += pnl
+
+            window_idx[n_trades] = w
+            offset_idx[n_trades] = o
+            bet_sizes[n_trades] = bet_size
+            pnls[n_trades] = pnl
+            bankrolls[n_trades] = bankroll
+            n_trades += 1
+
+            if bankroll <= 0:
+                break
+
+        if bankroll <= 0:
+            break
+
+    return (window_idx[:n_trades], offset_idx[:n_trades], bet_sizes[:n_trades],
+            pnls[:n_trades], bankrolls[:n_trades], bankroll)
+
 
 class BTCBacktester:
     """
@@ -40,14 +326,19 @@ class BTCBacktester:
     """
 
     def __init__(self, initial_bankroll: float = 1000.0,
-                 min_edge: float = 0.03):
+                 min_edge: float = 0.03, use_cache: bool = True,
+                 seed: int = 42):
         self.feed = BTCFeed()
-        self.strategy = BTCStrategy()
         self.initial_bankroll = initial_bankroll
         self.min_edge = min_edge
-
-    def run(self, days: int = 3) -> dict:
-        """Run backtest over the last N days."""
+        self.use_cache = use_cache
+        self._rng = np.random.default_rng(seed)  # PCG64, pickles cleanly into sweep workers
+
+    def run(self, days: int = 3, save: bool = True, save_trades: bool = True) -> dict:
+        """
+        Run backtest over the last N days. save=False skips the JSON dump;
+        save_trades=False writes only the summary, never building per-trade dicts.
+        """
         logger.info(f"\n🦜 Poly Wants A Cracker — BTC Backtest")
         logger.info(f"{'='*60}")
         logger.info(f"  Period: last {days} days")
@@ -65,170 +356,194 @@ class BTCBacktester:
         logger.info(f"📥 Fetching {total_candles} 1-min candles...")
 
         # We'll use what we can get (API limits)
-        klines = self.feed.get_klines(interval="1m", limit=min(total_candles, 1000))
-        if klines is None or len(klines) < 30:
+        klines = self._fetch_klines_cached(interval="1m", limit=min(total_candles, 1000))
+        if klines is None or len(klines["close"]) < 30:
             logger.error("❌ Could not fetch enough historical data")
             return {}
 
-        logger.info(f"  Got {len(klines)} candles")
+        logger.info(f"  Got {len(klines['close'])} candles")
 
         # Simulate 15-minute windows
-        closes = klines[:, 4]
-        highs = klines[:, 2]
-        lows = klines[:, 3]
-        volumes = klines[:, 5]
-        times = klines[:, 0]
-
-        bankroll = self.initial_bankroll
-        trades = []
-        wins = 0
-        losses = 0
-        total_pnl = 0.0
+        # Columns arrive as float32; sums and logs inside
+        # _precompute_indicators still accumulate in float64
+        closes = klines["close"]
+        highs = klines["high"]
+        lows = klines["low"]
+        volumes = klines["volume"]
 
         window_size = 15  # 15-minute windows
         lookback = 50     # Candles needed for indicators
-
-        for i in range(lookback, len(closes) - window_size, window_size):
-            # Current state (at window start)
-            current_price = closes[i]
-
-            # Simulate target price (use a price level near current)
-            # In reality, Polymarket sets specific targets — we simulate
-            # by testing above/below current price ± small offset
-            for offset_pct in [-0.001, 0.0, 0.001]:
-                target_price = current_price * (1 + offset_pct)
-                direction = "above" if offset_pct >= 0 else "below"
-
-                # Calculate our indicators using data up to window start
-                window_closes = closes[i-lookback:i+1]
-                window_highs = highs[i-lookback:i+1]
-                window_lows = lows[i-lookback:i+1]
-                window_volumes = volumes[i-lookback:i+1]
-
-                rsi = self.strategy._calculate_rsi(window_closes, config.BTC_RSI_PERIOD)
-                vwap = self.strategy._calculate_vwap(window_highs, window_lows, window_closes, window_volumes)
-                vwap_dev = (current_price - vwap) / vwap if vwap > 0 else 0
-                volatility = self.strategy._calculate_volatility(window_closes)
-                momentum = self.strategy._calculate_momentum(window_closes)
-
-                # Our probability estimate
-                our_prob = self.strategy._estimate_probability(
-                    current_price=current_price,
-                    target_price=target_price,
-                    direction=direction,
-                    rsi=rsi,
-                    vwap_deviation=vwap_dev,
-                    volatility=volatility,
-                    momentum=momentum,
-                    order_flow=0.0,
-                )
-
-                # Simulate a "market" probability (slightly noisy version of true prob)
-                # In real life this comes from Polymarket orderbook
-                end_price = closes[i + window_size - 1]
-                actual_above = end_price > target_price
-
-                # Simulated market prob (assume market is ~efficient with some noise)
-                true_prob = 0.5  # Base assumption
-                noise = np.random.normal(0, 0.05)
-                market_prob = np.clip(true_prob + noise, 0.1, 0.9)
-
-                edge = our_prob - market_prob
-                if abs(edge) < self.min_edge:
-                    continue
-
-                # Kelly sizing
-                kelly_f = RiskManager.kelly_size(our_prob, market_prob)
-                if kelly_f <= 0:
-                    continue
-
-                bet_size = min(bankroll * kelly_f, bankroll * config.MAX_SINGLE_BET_PCT)
-                if bet_size < config.MIN_BET_SIZE_USD:
-                    continue
-
-                # Determine outcome
-                if direction == "above":
-                    bet_on_yes = edge > 0
-                    outcome_yes = actual_above
-                else:
-                    bet_on_yes = edge > 0
-                    outcome_yes = not actual_above
-
-                won = (bet_on_yes and outcome_yes) or (not bet_on_yes and not outcome_yes)
-
-                if won:
-                    payout = bet_size * (1 / market_prob - 1) if bet_on_yes else bet_size * (1 / (1 - market_prob) - 1)
-                    pnl = payout
-                    wins += 1
-                else:
-                    pnl = -bet_size
-                    losses += 1
-
-                bankroll += pnl
-                total_pnl += pnl
-
-                trades.append({
-                    "time_idx": i,
-                    "price": current_price,
-                    "target": target_price,
-                    "direction": direction,
-                    "our_prob": our_prob,
-                    "market_prob": market_prob,
-                    "edge": edge,
-                    "kelly": kelly_f,
-                    "bet_size": bet_size,
-                    "won": won,
-                    "pnl": pnl,
-                    "bankroll": bankroll,
-                    "rsi": rsi,
-                })
-
-                if bankroll <= 0:
-                    logger.warning("💀 BANKRUPT!")
-                    break
-
-            if bankroll <= 0:
-                break
+        n_windows = len(range(lookback, len(closes) - window_size, window_size))
+
+        # Simulated market noise: one batch draw, one value per (window, offset)
+        noise = self._rng.normal(
+            0, 0.05, size=(n_windows, len(_OFFSETS))
+        ).astype(np.float32)
+
+        # Indicators for every candle up front; the kernel below only indexes
+        rsi_arr, vwap_arr, vol_arr, mom_arr = self._precompute_indicators(
+            closes, highs, lows, volumes, lookback
+        )
+
+        # Score all windows in parallel, then replay them in order against
+        # the bankroll (the only path-dependent part)
+        our_probs, market_probs, edges, kellys, won, payout_mult = _score_windows(
+            closes, rsi_arr, vwap_arr, vol_arr, mom_arr, noise, _OFFSETS,
+            lookback, window_size, config.KELLY_FRACTION, self.min_edge,
+            config.BTC_RSI_OVERSOLD, config.BTC_RSI_OVERBOUGHT,
+        )
+        window_idx, offset_idx, bet_sizes, pnls, bankrolls, bankroll = _simulate_trades(
+            edges, kellys, won, payout_mult, self.min_edge,
+            config.MAX_SINGLE_BET_PCT, config.MIN_BET_SIZE_USD,
+            self.initial_bankroll,
+        )
+        if bankroll <= 0:
+            logger.warning("💀 BANKRUPT!")
+
+        # One structured row per trade, filled column-by-column
+        time_idx = lookback + window_idx * window_size
+        offsets = _OFFSETS[offset_idx]
+        trades_arr = np.empty(len(window_idx), dtype=TRADE_DTYPE)
+        trades_arr["time_idx"] = time_idx
+        trades_arr["price"] = closes[time_idx]
+        trades_arr["target"] = closes[time_idx] * (1 + offsets)
+        trades_arr["direction"] = np.where(offsets >= 0, "above", "below")
+        trades_arr["our_prob"] = our_probs[window_idx, offset_idx]
+        trades_arr["market_prob"] = market_probs[window_idx, offset_idx]
+        trades_arr["edge"] = edges[window_idx, offset_idx]
+        trades_arr["kelly"] = kellys[window_idx, offset_idx]
+        trades_arr["bet_size"] = bet_sizes
+        trades_arr["won"] = won[window_idx, offset_idx]
+        trades_arr["pnl"] = pnls
+        trades_arr["bankroll"] = bankrolls
+        trades_arr["rsi"] = rsi_arr[time_idx]
+
+        n_trades = len(trades_arr)
+        wins = int(np.count_nonzero(trades_arr["won"]))
+        losses = n_trades - wins
 
         # Results
         results = {
-            "total_trades": len(trades),
+            "total_trades": n_trades,
             "wins": wins,
             "losses": losses,
             "win_rate": wins / (wins + losses) if (wins + losses) > 0 else 0,
-            "total_pnl": total_pnl,
+            "total_pnl": float(trades_arr["pnl"].sum()),
             "final_bankroll": bankroll,
             "return_pct": (bankroll - self.initial_bankroll) / self.initial_bankroll * 100,
-            "avg_edge": np.mean([t["edge"] for t in trades]) if trades else 0,
-            "avg_kelly": np.mean([t["kelly"] for t in trades]) if trades else 0,
-            "max_drawdown": self._calc_max_drawdown(trades),
+            "avg_edge": float(trades_arr["edge"].mean()) if n_trades else 0,
+            "avg_kelly": float(trades_arr["kelly"].mean()) if n_trades else 0,
+            "max_drawdown": self._calc_max_drawdown(trades_arr["bankroll"]),
         }
 
         self._print_results(results)
 
         # Save detailed trades
-        os.makedirs(config.LOG_DIR, exist_ok=True)
-        with open(os.path.join(config.LOG_DIR, "backtest_results.json"), "w") as f:
-            json.dump({"results": results, "trades": trades}, f, indent=2)
-        logger.info(f"\n📁 Detailed results saved to {config.LOG_DIR}/backtest_results.json")
+        if save:
+            os.makedirs(config.LOG_DIR, exist_ok=True)
+            payload = {"results": results}
+            if save_trades:
+                names = TRADE_DTYPE.names
+                payload["trades"] = [dict(zip(names, row)) for row in trades_arr.tolist()]
+            results_file = os.path.join(config.LOG_DIR, "backtest_results.json")
+            if HAS_ORJSON:
+                with open(results_file, "wb") as f:
+                    f.write(orjson.dumps(
+                        payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                    ))
+            else:
+                with open(results_file, "w") as f:
+                    json.dump(payload, f, indent=2)
+            logger.info(f"\n📁 Detailed results saved to {config.LOG_DIR}/backtest_results.json")
 
         return results
 
+    def _fetch_klines_cached(self, interval: str, limit: int):
+        """
+        Fetch klines, reusing an on-disk copy fetched within the same UTC hour.
+        Past candles never change, so repeated runs and sweep workers skip
+        the Binance round-trip entirely.
+        """
+        if not self.use_cache:
+            return self.feed.get_klines(interval=interval, limit=limit)
+
+        hour = datetime.now(timezone.utc).strftime("%Y%m%d%H")
+        key = hashlib.sha1(f"BTCUSDT-{interval}-{limit}-{hour}".encode()).hexdigest()
+        path = os.path.join(KLINES_CACHE_DIR, f"{key}.npz")
+
+        if os.path.exists(path):
+            try:
+                with np.load(path) as cached:
+                    klines = {col: cached[col] for col in ("high", "low", "close", "volume")}
+                logger.info(f"  Using cached klines ({path})")
+                return klines
+            except Exception as e:
+                logger.warning(f"Could not read klines cache: {e}")
+
+        klines = self.feed.get_klines(interval=interval, limit=limit)
+        if klines is not None:
+            os.makedirs(KLINES_CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, **klines)
+            os.replace(tmp, path)  # atomic, so parallel sweep workers never see a partial file
+        return klines
+
     @staticmethod
-    def _calc_max_drawdown(trades: list) -> float:
-        """Calculate maximum drawdown from trade history."""
-        if not trades:
+    def _precompute_indicators(closes: np.ndarray, highs: np.ndarray,
+                               lows: np.ndarray, volumes: np.ndarray,
+                               lookback: int = 50) -> tuple:
+        """
+        Calculate RSI, VWAP, volatility and momentum for every candle at once.
+
+        Element i of each returned array equals what the BTCStrategy
+        indicator for the window closes[i-lookback:i+1] would return, so the
+        backtest loop does O(1) work per window instead of re-scanning it.
+        The exception is RSI, which is Wilder-smoothed over all history up
+        to i (as a charting platform would show it) rather than re-seeded
+        at each window start. RSI and VWAP are streamed with O(1) updates per candle; volatility
+        uses the cumsum trick: sum(x[j:j+w]) = cs[j+w] - cs[j].
+        Accumulation happens in float64 (running sums and cumsum differences
+        cancel badly in float32); the returned arrays are float32.
+        """
+        n = len(closes)
+        period = config.BTC_RSI_PERIOD
+        vol_lookback = 20
+        mom_lookback = 10
+        vwap_window = min(60, lookback + 1)
+
+        def rolling_sum(x: np.ndarray, w: int) -> np.ndarray:
+            cs = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+            return cs[w:] - cs[:-w]
+
+        # RSI and VWAP — one streaming pass each
+        rsi_arr = _rsi_streaming(closes, period)
+        vwap_arr = _vwap_streaming(highs, lows, closes, volumes, vwap_window)
+
+        # Volatility — population std of the last `vol_lookback` log returns
+        vol_arr = np.full(n, 0.001, dtype=np.float32)
+        if n > vol_lookback:
+            returns = np.diff(np.log(closes.astype(np.float64)))
+            mean = rolling_sum(returns, vol_lookback) / vol_lookback
+            mean_sq = rolling_sum(returns ** 2, vol_lookback) / vol_lookback
+            vol_arr[vol_lookback:] = np.sqrt(np.maximum(mean_sq - mean ** 2, 0.0))
+
+        # Momentum — rate of change over `mom_lookback` candles
+        mom_arr = np.zeros(n, dtype=np.float32)
+        if n > mom_lookback:
+            past = closes[:-mom_lookback]
+            mom_arr[mom_lookback:] = (closes[mom_lookback:] - past) / past
+
+        return rsi_arr, vwap_arr, vol_arr, mom_arr
+
+    @staticmethod
+    def _calc_max_drawdown(bankrolls: np.ndarray) -> float:
+        """Calculate maximum drawdown from the running bankroll after each trade."""
+        if len(bankrolls) == 0:
             return 0.0
-        bankrolls = [t["bankroll"] for t in trades]
-        peak = bankrolls[0]
-        max_dd = 0.0
-        for b in bankrolls:
-            if b > peak:
-                peak = b
-            dd = (peak - b) / peak
-            if dd > max_dd:
-                max_dd = dd
-        return max_dd
+        peaks = np.maximum.accumulate(bankrolls)
+        peaks = np.where(peaks <= 0, 1.0, peaks)
+        return float(((peaks - bankrolls) / peaks).max())
 
     @staticmethod
     def _print_results(results: dict):
@@ -256,18 +571,103 @@ class BTCBacktester:
             logger.info("  🦜 Oof... negative edge detected. Time to recalibrate!")
 
 
+# ═══════════════════════════════════════════════════════════════
+#  Parameter sweeps
+# ═══════════════════════════════════════════════════════════════
+
+def _run_sweep_point(days: int, threshold: float, bankroll: float,
+                     use_cache: bool, seed: int) -> dict:
+    """Run one grid point in a worker process (quietly, without saving)."""
+    logger.setLevel(logging.WARNING)
+    if HAS_NUMBA:
+        # The pool already fills every core; a parallel kernel per worker would oversubscribe
+        import numba
+        numba.set_num_threads(1)
+    bt = BTCBacktester(initial_bankroll=bankroll, min_edge=threshold,
+                       use_cache=use_cache, seed=seed)
+    return bt.run(days=days, save=False)
+
+
+def run_sweep(days_grid: list, threshold_grid: list, bankroll: float,
+              use_cache: bool = True, seed: int = 42) -> list:
+    """
+    Backtest every (days, threshold) combination in parallel.
+    Each point is an independent backtest, so they fan out across all cores;
+    all points share one seed so they see the same simulated market noise.
+    Writes a CSV summary to LOG_DIR and returns one row dict per point.
+    """
+    points = list(itertools.product(days_grid, threshold_grid))
+    logger.info(f"\n🦜 Sweeping {len(points)} backtests across {os.cpu_count()} workers...")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        futures = {
+            ex.submit(_run_sweep_point, days, threshold, bankroll, use_cache, seed): (days, threshold)
+            for days, threshold in points
+        }
+        for fut in as_completed(futures):
+            days, threshold = futures[fut]
+            try:
+                results = fut.result()
+            except Exception as e:
+                logger.error(f"  ❌ days={days} threshold={threshold}: {e}")
+                continue
+            if results:
+                rows.append({"days": days, "threshold": threshold, **results})
+
+    rows.sort(key=lambda r: (r["days"], r["threshold"]))
+
+    logger.info(f"\n{'='*60}")
+    logger.info(f"📊 SWEEP RESULTS")
+    logger.info(f"{'='*60}")
+    logger.info(f"  {'Days':>4}  {'Thresh':>6}  {'Trades':>6}  {'Win%':>6}  {'Return':>8}  {'MaxDD':>6}")
+    for r in rows:
+        logger.info(f"  {r['days']:>4}  {r['threshold']:>6.3f}  {r['total_trades']:>6}  "
+                    f"{r['win_rate']:>6.1%}  {r['return_pct']:>+7.1f}%  {r['max_drawdown']:>6.1%}")
+
+    if rows:
+        os.makedirs(config.LOG_DIR, exist_ok=True)
+        sweep_file = os.path.join(config.LOG_DIR, "backtest_sweep.csv")
+        with open(sweep_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        logger.info(f"\n📁 Sweep summary saved to {sweep_file}")
+
+    return rows
+
+
 def main():
     parser = argparse.ArgumentParser(description="🦜 Poly Wants A Cracker — Backtester")
     parser.add_argument("--days", type=int, default=3, help="Number of days to backtest")
     parser.add_argument("--threshold", type=float, default=0.03, help="Min edge threshold")
     parser.add_argument("--bankroll", type=float, default=1000.0, help="Starting bankroll")
+    parser.add_argument("--sweep", action="store_true", help="Run a grid of backtests in parallel")
+    parser.add_argument("--threshold-grid", nargs="+", type=float, help="Thresholds to sweep (with --sweep)")
+    parser.add_argument("--days-grid", nargs="+", type=int, help="Day counts to sweep (with --sweep)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk klines cache")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the simulated market noise")
+    parser.add_argument("--no-save-trades", action="store_true",
+                        help="Save only the summary, not every trade")
     args = parser.parse_args()
 
+    if args.sweep:
+        run_sweep(
+            days_grid=args.days_grid or [args.days],
+            threshold_grid=args.threshold_grid or [args.threshold],
+            bankroll=args.bankroll,
+            use_cache=not args.no_cache,
+            seed=args.seed,
+        )
+        return
+
     bt = BTCBacktester(
         initial_bankroll=args.bankroll,
         min_edge=args.threshold,
+        use_cache=not args.no_cache,
+        seed=args.seed,
     )
-    bt.run(days=args.days)
+    bt.run(days=args.days, save_trades=not args.no_save_trades)
 
 
 if __name__ == "__main__":
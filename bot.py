@@ -25,7 +25,9 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from typing import Optional
 
 import config
 from polymarket_client import PolymarketClient
@@ -68,7 +70,7 @@ class PollyBot:
     def __init__(self):
         self.client = PolymarketClient()
         self.risk = RiskManager()
-        self.btc_strategy = BTCStrategy()
+        self.btc_strategy = BTCStrategy.get_default()
         self.weather_strategy = WeatherStrategy()
 
     def run(self, btc: bool = True, weather: bool = True, scan_once: bool = False):
@@ -88,11 +90,19 @@ class PollyBot:
             logger.error("❌ Live trading requires authentication! Set POLYMARKET_PRIVATE_KEY.")
             logger.info("💡 Running in paper mode instead.")
 
+        # Sleep until next scan: the faster of the enabled strategies
+        sleep_interval = min(
+            config.BTC_SCAN_INTERVAL_SECONDS if btc else 9999,
+            config.WEATHER_SCAN_INTERVAL_SECONDS if weather else 9999,
+        )
+
         cycle = 0
         while True:
             cycle += 1
-            logger.info(f"{'='*60}")
-            logger.info(f"🔄 Scan cycle #{cycle} — {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}")
+            logger.info("=" * 60)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🔄 Scan cycle #%d — %s", cycle,
+                            datetime.now(timezone.utc).strftime("%H:%M:%S UTC"))
 
             try:
                 if btc:
@@ -107,28 +117,23 @@ class PollyBot:
                 logger.info("🛑 Shutting down gracefully...")
                 break
             except Exception as e:
-                logger.error(f"💥 Error in scan cycle: {e}", exc_info=True)
+                logger.error("💥 Error in scan cycle: %s", e, exc_info=True)
 
             if scan_once:
                 break
 
-            # Sleep until next scan
-            interval = min(
-                config.BTC_SCAN_INTERVAL_SECONDS if btc else 9999,
-                config.WEATHER_SCAN_INTERVAL_SECONDS if weather else 9999,
-            )
-            logger.info(f"💤 Next scan in {interval}s...")
-            time.sleep(interval)
+            logger.info("💤 Next scan in %ss...", sleep_interval)
+            time.sleep(sleep_interval)
 
     def _run_btc_scan(self):
         """Scan BTC 15-minute markets for edge."""
         logger.info("₿ Scanning BTC 15-min markets...")
         markets = self.client.find_btc_markets()
-        logger.info(f"  Found {len(markets)} active BTC markets")
+        logger.info("  Found %d active BTC markets", len(markets))
 
-        for market in markets:
+        for market, prob_future in self._fetch_market_probabilities(markets):
             try:
-                market_prob = self.client.get_market_probability(market)
+                market_prob = prob_future.result()
                 if market_prob is None:
                     continue
 
@@ -136,60 +141,88 @@ class PollyBot:
                 if signal is None:
                     continue
 
-                logger.info(f"  📊 {signal.market_question[:60]}")
-                logger.info(f"     Edge: {signal.edge:+.3f} | Our: {signal.our_probability:.3f} | Market: {signal.market_probability:.3f}")
+                logger.info("  📊 %.60s", signal.market_question)
+                logger.info("     Edge: %+.3f | Our: %.3f | Market: %.3f",
+                            signal.edge, signal.our_probability, signal.market_probability)
 
                 if abs(signal.edge) >= config.MIN_EDGE_THRESHOLD:
                     self._execute_signal(signal, "btc")
                 else:
-                    logger.debug(f"     ⏭️ Edge too small, skipping")
+                    logger.debug("     ⏭️ Edge too small, skipping")
 
             except Exception as e:
-                logger.error(f"  Error analyzing BTC market: {e}")
+                logger.error("  Error analyzing BTC market: %s", e)
 
     def _run_weather_scan(self):
         """Scan weather markets for edge."""
         logger.info("🌤️ Scanning weather markets...")
         markets = self.client.find_weather_markets()
-        logger.info(f"  Found {len(markets)} active weather markets")
+        logger.info("  Found %d active weather markets", len(markets))
 
-        for market in markets:
+        priced, probs = [], []
+        for market, prob_future in self._fetch_market_probabilities(markets):
             try:
-                market_prob = self.client.get_market_probability(market)
-                if market_prob is None:
-                    continue
-
-                signal = self.weather_strategy.analyze_market(market, market_prob)
-                if signal is None:
-                    continue
-
-                logger.info(f"  🌡️ {signal.market_question[:60]}")
-                logger.info(f"     Edge: {signal.edge:+.3f} | Our: {signal.our_probability:.3f} | Market: {signal.market_probability:.3f}")
-
-                if abs(signal.edge) >= config.MIN_EDGE_THRESHOLD:
-                    self._execute_signal(signal, "weather")
-                else:
-                    logger.debug(f"     ⏭️ Edge too small, skipping")
-
+                market_prob = prob_future.result()
             except Exception as e:
-                logger.error(f"  Error analyzing weather market: {e}")
+                logger.error("  Error pricing weather market: %s", e)
+                continue
+            if market_prob is not None:
+                priced.append(market)
+                probs.append(market_prob)
+
+        # One batch: forecasts fetched once per city, markets scored together
+        try:
+            signals = self.weather_strategy.analyze_markets(priced, probs)
+        except Exception as e:
+            logger.error("  Error analyzing weather markets: %s", e)
+            return
 
-    def _execute_signal(self, signal, strategy: str):
+        # Size the whole batch at once; calculate_bet_size reuses these
+        kelly = RiskManager.kelly_size_vec([s.our_probability for s in signals],
+                                           [s.market_probability for s in signals])
+        for signal, kf in zip(signals, kelly):
+            logger.info("  🌡️ %.60s", signal.market_question)
+            logger.info("     Edge: %+.3f | Our: %.3f | Market: %.3f",
+                        signal.edge, signal.our_probability, signal.market_probability)
+            self._execute_signal(signal, "weather", kelly=kf)
+
+    def _fetch_market_probabilities(self, markets: list):
+        """
+        Look up market probabilities concurrently and yield
+        (market, future) pairs as each lookup completes.
+
+        The lookups are network-bound, so threads overlap the waits.
+        Analysis and execution stay on the calling thread, so bankroll
+        updates never race.
+        """
+        if not markets:
+            return
+        # One batched CLOB request for the markets that lack outcomePrices
+        self.client.prefetch_midpoints(markets)
+        workers = min(config.SCAN_MAX_WORKERS, len(markets))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(self.client.get_market_probability, m): m for m in markets}
+            for fut in as_completed(futures):
+                yield futures[fut], fut
+
+    def _execute_signal(self, signal, strategy: str, kelly: Optional[float] = None):
         """Execute a trade based on a signal (paper or live)."""
         market_prob = signal.market_probability
         our_prob = signal.our_probability
 
-        bet_size, kelly_f, rejection = self.risk.calculate_bet_size(our_prob, market_prob, strategy)
+        bet_size, kelly_f, rejection = self.risk.calculate_bet_size(our_prob, market_prob,
+                                                                    strategy, kelly=kelly)
 
         if rejection:
-            logger.info(f"     🚫 Rejected: {rejection}")
+            logger.info("     🚫 Rejected: %s", rejection)
             return
 
         side = signal.recommended_side
         entry_price = market_prob  # Approximate
 
-        logger.info(f"     ✅ SIGNAL: {side} ${bet_size:.2f} (Kelly={kelly_f:.3f}, edge={signal.edge:+.3f})")
-        logger.info(f"     📝 {signal.reasoning}")
+        logger.info("     ✅ SIGNAL: %s $%.2f (Kelly=%.3f, edge=%+.3f)",
+                    side, bet_size, kelly_f, signal.edge)
+        logger.info("     📝 %s", signal.reasoning)
 
         if config.PAPER_TRADING:
             # Paper trade — just record it
@@ -205,7 +238,7 @@ class PollyBot:
                 strategy=strategy,
                 reasoning=signal.reasoning,
             )
-            logger.info(f"     📄 Paper trade recorded")
+            logger.info("     📄 Paper trade recorded")
         else:
             # Live trade
             if not signal.token_id:
@@ -219,7 +252,7 @@ class PollyBot:
             )
 
             if "error" in result:
-                logger.error(f"     ❌ Order failed: {result['error']}")
+                logger.error("     ❌ Order failed: %s", result["error"])
             else:
                 self.risk.open_position(
                     market_id=signal.market_id,
@@ -233,16 +266,18 @@ class PollyBot:
                     strategy=strategy,
                     reasoning=signal.reasoning,
                 )
-                logger.info(f"     💰 LIVE order placed: {result}")
+                logger.info("     💰 LIVE order placed: %s", result)
 
     def _print_status(self):
         """Print current portfolio status."""
+        if not logger.isEnabledFor(logging.INFO):
+            return  # skip building stats nobody will see
         stats = self.risk.get_stats()
         logger.info(f"  📊 Portfolio: bankroll=${stats['bankroll']:,.2f} | "
-                     f"open={stats['open_positions']} | "
-                     f"exposure=${stats['total_exposure']:,.2f} | "
-                     f"PnL=${stats['total_pnl']:+,.2f} | "
-                     f"W/L={stats['wins']}/{stats['losses']}")
+                    f"open={stats['open_positions']} | "
+                    f"exposure=${stats['total_exposure']:,.2f} | "
+                    f"PnL=${stats['total_pnl']:+,.2f} | "
+                    f"W/L={stats['wins']}/{stats['losses']}")
 
     def show_status(self):
         """Display detailed portfolio status."""
@@ -256,7 +291,7 @@ class PollyBot:
         print(f"  ❌ Losses:         {stats['losses']}")
         print(f"  📈 Win Rate:       {stats['win_rate']:.1%}")
 
-        open_pos = [p for p in self.risk.positions if p.status == "open"]
+        open_pos = self.risk.open_positions
         if open_pos:
             print(f"\n  Open Positions:")
             for p in open_pos:
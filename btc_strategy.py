@@ -12,16 +12,36 @@ Indicators used:
 """
 
 import logging
+import math
 import re
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from typing import Optional
 from dataclasses import dataclass
 
 import config
-from data_feeds import BTCFeed
+from data_feeds import BTCFeed, parse_token_ids
+from jit import njit
 
 logger = logging.getLogger("polly.btc")
 
+# Market question parsing, compiled once (case-insensitive, so no lower() copy)
+_ABOVE_RE = re.compile(r"above|over", re.IGNORECASE)
+_BELOW_RE = re.compile(r"below|under", re.IGNORECASE)
+_PRICE_RE = re.compile(r"\$?([\d,]+(?:\.\d+)?)")
+
+_SQRT_15 = math.sqrt(15.0)  # 15-min horizon on 1-min volatility
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+# Config read once at import, not per market
+_RSI_PERIOD = config.BTC_RSI_PERIOD
+_RSI_OVERSOLD = float(config.BTC_RSI_OVERSOLD)
+_RSI_OVERBOUGHT = float(config.BTC_RSI_OVERBOUGHT)
+_MIN_EDGE = config.MIN_EDGE_THRESHOLD
+_VWAP_CANDLES = config.BTC_VWAP_LOOKBACK_MINUTES  # 1-minute candles
+_VOL_LOOKBACK = config.BTC_VOLATILITY_LOOKBACK
+_MOMENTUM_LOOKBACK = 10
+
 
 @dataclass
 class BTCSignal:
@@ -40,14 +60,246 @@ class BTCSignal:
     components: dict        # Individual indicator readings
 
 
+@njit(cache=True)
+def _estimate_probability_jit(current_price, target_price, is_above, rsi,
+                              vwap_deviation, volatility, momentum, order_flow,
+                              rsi_oversold, rsi_overbought):
+    """
+    Numeric core of BTCStrategy._estimate_probability (floats and a bool
+    only, so the backtest kernel can call it from compiled code).
+    RSI thresholds are arguments because Numba freezes globals at compile time.
+    """
+    # Price distance as fraction
+    distance = (target_price - current_price) / current_price
+
+    # Base probability: how likely to cross the target
+    # Using a simple normal distribution assumption
+    # 15-min expected move ≈ volatility * sqrt(15)
+    expected_move = volatility * _SQRT_15
+    if expected_move < 0.0001:
+        expected_move = 0.0001
+
+    # +1 for "above", -1 for "below": every directional term is sign * x
+    sign = 1.0 if is_above else -1.0
+
+    # P(price > target) = P(move > distance); mirrored for "below"
+    z_score = sign * distance / expected_move
+    # 1 - Φ(z) via the complementary error function
+    base_prob = 0.5 * math.erfc(z_score * _INV_SQRT2)
+
+    # ── Adjustments ──────────────────────────────────────
+
+    adjustment = 0.0
+
+    # RSI adjustment: oversold = likely to bounce up, overbought = likely to drop
+    if rsi < rsi_oversold:
+        # Oversold → more likely to go UP
+        rsi_adj = 0.05 * (rsi_oversold - rsi) / rsi_oversold
+        adjustment += sign * rsi_adj
+    elif rsi > rsi_overbought:
+        # Overbought → more likely to go DOWN
+        rsi_adj = -0.05 * (rsi - rsi_overbought) / (100 - rsi_overbought)
+        adjustment += sign * rsi_adj
+
+    # VWAP deviation: price far from VWAP tends to revert
+    if abs(vwap_deviation) > 0.001:
+        vwap_adj = -vwap_deviation * 0.5  # Mean reversion
+        adjustment += sign * vwap_adj
+
+    # Momentum: recent trend continuation
+    mom_adj = momentum * 10  # Scale momentum signal
+    adjustment += sign * mom_adj
+
+    # Order flow: buy/sell pressure
+    flow_adj = order_flow * 0.03
+    adjustment += sign * flow_adj
+
+    # Apply adjustment with bounds
+    return min(max(base_prob + adjustment, 0.02), 0.98)
+
+
+@njit(cache=True)
+def _rsi_wilder(closes, period):
+    """
+    Wilder's RSI over the whole series in one pass: average gain/loss are
+    seeded from the first `period` deltas, then smoothed as
+    avg = (avg * (period - 1) + x) / period. Needs len(closes) > period.
+    """
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for k in range(1, period + 1):
+        delta = closes[k] - closes[k - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for k in range(period + 1, len(closes)):
+        delta = closes[k] - closes[k - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, fastmath=True)
+def _vwap_nb(highs, lows, closes, volumes, n):
+    """
+    VWAP over the last `n` candles in one fused pass, accumulating
+    sum(tp * vol) and sum(vol) in float64. Zero volume reads the last close.
+    """
+    sum_tpv = 0.0
+    sum_vol = 0.0
+    for i in range(max(0, len(closes) - n), len(closes)):
+        tp = (np.float64(highs[i]) + lows[i] + closes[i]) / 3.0
+        vol = np.float64(volumes[i])
+        sum_tpv += tp * vol
+        sum_vol += vol
+    if sum_vol == 0:
+        return np.float64(closes[-1])
+    return sum_tpv / sum_vol
+
+
+@njit(cache=True)
+def _order_flow_nb(qty, is_buyer_maker):
+    """
+    (buy volume - sell volume) / total volume in one pass. A buyer-maker
+    trade is a taker sell, so each trade's sign is 1 - 2 * is_buyer_maker.
+    """
+    net = 0.0
+    total = 0.0
+    for i in range(len(qty)):
+        q = np.float64(qty[i])
+        net += (1.0 - 2.0 * is_buyer_maker[i]) * q
+        total += q
+    if total == 0:
+        return 0.0
+    return net / total
+
+
+@njit(cache=True)
+def _volatility_nb(closes, lookback):
+    """
+    Population std of the last `lookback` log returns in one pass
+    (Welford's online mean/M2), without the log and diff temporaries.
+    """
+    mean = 0.0
+    m2 = 0.0
+    start = len(closes) - lookback
+    for k in range(lookback):
+        i = start + k
+        r = math.log(np.float64(closes[i]) / closes[i - 1])
+        delta = r - mean
+        mean += delta / (k + 1)
+        m2 += delta * (r - mean)
+    return math.sqrt(m2 / lookback)
+
+
+@njit(cache=True)
+def _indicators_nb(highs, lows, closes, volumes, rsi_period, vol_lookback,
+                   mom_lookback, vwap_n):
+    """
+    RSI, VWAP, volatility and momentum in one pass over the candles.
+
+    Same results (and short-series fallbacks) as the individual
+    _calculate_* methods, but every array is read once. Returns
+    (rsi, vwap, volatility, momentum).
+    """
+    n = len(closes)
+
+    # Short-series fallbacks, as in the per-indicator methods
+    has_rsi = n >= rsi_period + 1
+    vol_lb = vol_lookback if n >= vol_lookback + 1 else n - 1
+    vwap_start = max(0, n - vwap_n)
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    sum_tpv = 0.0
+    sum_vol = 0.0
+    vol_mean = 0.0
+    vol_m2 = 0.0
+    vol_count = 0
+
+    for i in range(n):
+        # VWAP over the last vwap_n candles
+        if i >= vwap_start:
+            tp = (np.float64(highs[i]) + lows[i] + closes[i]) / 3.0
+            vol = np.float64(volumes[i])
+            sum_tpv += tp * vol
+            sum_vol += vol
+        if i == 0:
+            continue
+
+        # Wilder RSI: seed from the first rsi_period deltas, then smooth
+        if has_rsi:
+            delta = closes[i] - closes[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_period:
+                    avg_gain /= rsi_period
+                    avg_loss /= rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+
+        # Welford over the last vol_lb log returns
+        if vol_lb >= 2 and i >= n - vol_lb:
+            r = math.log(np.float64(closes[i]) / closes[i - 1])
+            vol_count += 1
+            d = r - vol_mean
+            vol_mean += d / vol_count
+            vol_m2 += d * (r - vol_mean)
+
+    if not has_rsi:
+        rsi = 50.0
+    elif avg_loss == 0:
+        rsi = 100.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    vwap = sum_tpv / sum_vol if sum_vol != 0 else np.float64(closes[-1])
+    volatility = math.sqrt(vol_m2 / vol_lb) if vol_lb >= 2 else 0.001
+
+    if n < mom_lookback + 1:
+        momentum = 0.0
+    else:
+        past = np.float64(closes[n - mom_lookback - 1])
+        momentum = (closes[-1] - past) / past
+
+    return rsi, vwap, volatility, momentum
+
+
 class BTCStrategy:
     """
     Analyzes BTC price action to estimate probability of
     BTC being above/below a target price in a 15-min window.
+
+    Hold one instance for the life of the scanner (see get_default): its
+    BTCFeed owns the pooled Binance session and the response TTL cache,
+    which only pay off when shared across markets and scans.
     """
 
+    _default: Optional["BTCStrategy"] = None
+
     def __init__(self):
         self.feed = BTCFeed()
+        self._pool = ThreadPoolExecutor(max_workers=4)
+
+    @classmethod
+    def get_default(cls) -> "BTCStrategy":
+        """Process-wide shared instance, created on first use."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
 
     def analyze_market(self, market: dict, market_probability: float) -> Optional[BTCSignal]:
         """
@@ -60,30 +312,38 @@ class BTCStrategy:
             logger.debug(f"Could not parse BTC market: {question}")
             return None
 
-        # Fetch current data
-        current_price = self.feed.get_current_price()
+        # Fetch current data — the three Binance calls are independent,
+        # so they run concurrently and cost one round-trip instead of three
+        feed, pool = self.feed, self._pool
+        price_future = pool.submit(feed.get_current_price)
+        klines_future = pool.submit(
+            feed.get_klines, interval=config.BTC_CANDLE_INTERVAL, limit=100
+        )
+        trades_future = pool.submit(feed.get_recent_trades, limit=200)
+
+        current_price = price_future.result()
         if current_price is None:
             return None
 
-        klines = self.feed.get_klines(interval=config.BTC_CANDLE_INTERVAL, limit=100)
-        if klines is None or len(klines) < 20:
+        klines = klines_future.result()
+        if klines is None or len(klines["close"]) < 20:
             return None
 
         # Calculate indicators
-        closes = klines[:, 4]   # close prices
-        highs = klines[:, 2]
-        lows = klines[:, 3]
-        volumes = klines[:, 5]
-
-        rsi = self._calculate_rsi(closes, config.BTC_RSI_PERIOD)
-        vwap = self._calculate_vwap(highs, lows, closes, volumes)
+        closes = klines["close"]
+        highs = klines["high"]
+        lows = klines["low"]
+        volumes = klines["volume"]
+
+        rsi, vwap, volatility, momentum = (float(x) for x in _indicators_nb(
+            highs, lows, closes, volumes, _RSI_PERIOD, _VOL_LOOKBACK,
+            _MOMENTUM_LOOKBACK, _VWAP_CANDLES,
+        ))
         vwap_deviation = (current_price - vwap) / vwap if vwap > 0 else 0
-        volatility = self._calculate_volatility(closes)
-        momentum = self._calculate_momentum(closes)
 
         # Order flow analysis
-        trades = self.feed.get_recent_trades(limit=200)
-        order_flow = self._analyze_order_flow(trades) if trades else 0.0
+        trades = trades_future.result()
+        order_flow = self._analyze_order_flow(trades) if trades is not None else 0.0
 
         # Calculate our probability
         our_prob = self._estimate_probability(
@@ -102,7 +362,7 @@ class BTCStrategy:
         # Determine recommended side
         if edge > 0:
             recommended_side = "YES"
-        elif (1 - our_prob) - (1 - market_probability) > config.MIN_EDGE_THRESHOLD:
+        elif (1 - our_prob) - (1 - market_probability) > _MIN_EDGE:
             recommended_side = "NO"
             our_prob = 1 - our_prob
             market_probability = 1 - market_probability
@@ -113,11 +373,7 @@ class BTCStrategy:
         # Get token ID
         token_ids = market.get("clobTokenIds", "")
         if isinstance(token_ids, str):
-            import json
-            try:
-                token_ids = json.loads(token_ids)
-            except Exception:
-                token_ids = []
+            token_ids = parse_token_ids(token_ids)
         token_id = token_ids[0] if token_ids else ""
 
         components = {
@@ -163,98 +419,28 @@ class BTCStrategy:
         Approach: Start with a base probability from price distance,
         then adjust using technical indicators.
         """
-        # Price distance as fraction
-        distance = (target_price - current_price) / current_price
-
-        # Base probability: how likely to cross the target
-        # Using a simple normal distribution assumption
-        # 15-min expected move ≈ volatility * sqrt(15)
-        expected_move = volatility * np.sqrt(15)
-        if expected_move < 0.0001:
-            expected_move = 0.0001
-
-        if direction == "above":
-            # P(price > target) = P(move > distance)
-            z_score = distance / expected_move
-            from scipy.stats import norm
-            try:
-                base_prob = 1 - norm.cdf(z_score)
-            except ImportError:
-                # Fallback: sigmoid approximation
-                base_prob = 1.0 / (1.0 + np.exp(z_score * 2))
-        else:  # "below"
-            z_score = -distance / expected_move
-            try:
-                from scipy.stats import norm
-                base_prob = 1 - norm.cdf(z_score)
-            except ImportError:
-                base_prob = 1.0 / (1.0 + np.exp(z_score * 2))
-
-        # ── Adjustments ──────────────────────────────────────
-
-        adjustment = 0.0
-
-        # RSI adjustment: oversold = likely to bounce up, overbought = likely to drop
-        if rsi < config.BTC_RSI_OVERSOLD:
-            # Oversold → more likely to go UP
-            rsi_adj = 0.05 * (config.BTC_RSI_OVERSOLD - rsi) / config.BTC_RSI_OVERSOLD
-            adjustment += rsi_adj if direction == "above" else -rsi_adj
-        elif rsi > config.BTC_RSI_OVERBOUGHT:
-            # Overbought → more likely to go DOWN
-            rsi_adj = 0.05 * (rsi - config.BTC_RSI_OVERBOUGHT) / (100 - config.BTC_RSI_OVERBOUGHT)
-            adjustment += -rsi_adj if direction == "above" else rsi_adj
-
-        # VWAP deviation: price far from VWAP tends to revert
-        if abs(vwap_deviation) > 0.001:
-            vwap_adj = -vwap_deviation * 0.5  # Mean reversion
-            adjustment += vwap_adj if direction == "above" else -vwap_adj
-
-        # Momentum: recent trend continuation
-        mom_adj = momentum * 10  # Scale momentum signal
-        adjustment += mom_adj if direction == "above" else -mom_adj
-
-        # Order flow: buy/sell pressure
-        flow_adj = order_flow * 0.03
-        adjustment += flow_adj if direction == "above" else -flow_adj
-
-        # Apply adjustment with bounds
-        our_prob = np.clip(base_prob + adjustment, 0.02, 0.98)
-
-        return float(our_prob)
+        return float(_estimate_probability_jit(
+            float(current_price), float(target_price), direction == "above",
+            float(rsi), float(vwap_deviation), float(volatility),
+            float(momentum), float(order_flow),
+            _RSI_OVERSOLD, _RSI_OVERBOUGHT,
+        ))
 
     # ── Technical Indicators ─────────────────────────────────
 
     @staticmethod
     def _calculate_rsi(closes: np.ndarray, period: int = 14) -> float:
-        """Calculate RSI (Relative Strength Index)."""
+        """Calculate RSI (Relative Strength Index), Wilder-smoothed."""
         if len(closes) < period + 1:
             return 50.0  # neutral
-
-        deltas = np.diff(closes)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
-
-        if avg_loss == 0:
-            return 100.0
-        rs = avg_gain / avg_loss
-        return 100.0 - (100.0 / (1.0 + rs))
+        return float(_rsi_wilder(closes, period))
 
     @staticmethod
     def _calculate_vwap(highs: np.ndarray, lows: np.ndarray,
                         closes: np.ndarray, volumes: np.ndarray) -> float:
         """Calculate Volume Weighted Average Price."""
-        typical_price = (highs + lows + closes) / 3.0
         # Use last 60 candles for VWAP
-        n = min(60, len(typical_price))
-        tp = typical_price[-n:]
-        vol = volumes[-n:]
-        total_vol = np.sum(vol)
-        if total_vol == 0:
-            return closes[-1]
-        return float(np.sum(tp * vol) / total_vol)
+        return float(_vwap_nb(highs, lows, closes, volumes, 60))
 
     @staticmethod
     def _calculate_volatility(closes: np.ndarray, lookback: int = 20) -> float:
@@ -263,8 +449,7 @@ class BTCStrategy:
             lookback = len(closes) - 1
         if lookback < 2:
             return 0.001
-        returns = np.diff(np.log(closes[-lookback-1:]))
-        return float(np.std(returns))
+        return float(_volatility_nb(closes, lookback))
 
     @staticmethod
     def _calculate_momentum(closes: np.ndarray, lookback: int = 10) -> float:
@@ -274,25 +459,12 @@ class BTCStrategy:
         return float((closes[-1] - closes[-lookback-1]) / closes[-lookback-1])
 
     @staticmethod
-    def _analyze_order_flow(trades: list) -> float:
+    def _analyze_order_flow(trades: dict) -> float:
         """
         Analyze recent trades for buy/sell imbalance.
         Returns value from -1 (all sells) to +1 (all buys).
         """
-        if not trades:
-            return 0.0
-        buy_volume = 0.0
-        sell_volume = 0.0
-        for t in trades:
-            qty = float(t.get("qty", 0))
-            if t.get("isBuyerMaker", False):
-                sell_volume += qty  # Buyer is maker = seller is taker
-            else:
-                buy_volume += qty
-        total = buy_volume + sell_volume
-        if total == 0:
-            return 0.0
-        return (buy_volume - sell_volume) / total
+        return float(_order_flow_nb(trades["qty"], trades["is_buyer_maker"]))
 
     # ── Market Parsing ───────────────────────────────────────
 
@@ -304,20 +476,16 @@ class BTCStrategy:
           "Will BTC be above $97,500 at 12:15 PM ET?" → (97500, "above")
           "Bitcoin below $96,000 on Feb 10?" → (96000, "below")
         """
-        question_lower = question.lower()
-
         # Determine direction
-        direction = None
-        if "above" in question_lower or "over" in question_lower:
+        if _ABOVE_RE.search(question):
             direction = "above"
-        elif "below" in question_lower or "under" in question_lower:
+        elif _BELOW_RE.search(question):
             direction = "below"
-
-        if direction is None:
+        else:
             return None, None
 
         # Extract price (handles $97,500 or $97500 formats)
-        price_match = re.search(r'\$?([\d,]+(?:\.\d+)?)', question)
+        price_match = _PRICE_RE.search(question)
         if price_match:
             price_str = price_match.group(1).replace(",", "")
             try:
@@ -16,6 +16,16 @@ except ImportError:
 POLYMARKET_HOST = "https://clob.polymarket.com"
 POLYMARKET_GAMMA_API = "https://gamma-api.polymarket.com"
 POLYMARKET_CHAIN_ID = 137  # Polygon
+# Response TTLs (seconds) — market lists change slowly, prices don't
+GAMMA_MARKETS_CACHE_TTL = 60
+GAMMA_EVENTS_CACHE_TTL = 30
+CLOB_MIDPOINT_CACHE_TTL = 5
+# Live book stream — pushes midpoints instead of polling them (opt-in: the
+# first scan still polls, since the stream has no books yet)
+POLYMARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+CLOB_WS_ENABLED = os.getenv("CLOB_WS_ENABLED", "false").lower() == "true"
+CLOB_WS_HEARTBEAT_SECONDS = 30
+CLOB_WS_MAX_BACKOFF_SECONDS = 60
 
 # Auth (leave empty for paper trading / read-only)
 POLYMARKET_PRIVATE_KEY = os.getenv("POLYMARKET_PRIVATE_KEY", "")
@@ -46,9 +56,17 @@ BTC_SCAN_INTERVAL_SECONDS = 30
 WEATHER_SCAN_INTERVAL_SECONDS = 300  # 5 min
 WEATHER_MIN_CONFIDENCE = 0.7  # Minimum forecast confidence to consider
 
+# ─── Scanning ─────────────────────────────────────────────────
+SCAN_MAX_WORKERS = 16  # Concurrent market lookups per scan (network-bound)
+GAMMA_MAX_WORKERS = 4  # Concurrent Gamma discovery queries (kept low for rate limits)
+
 # ─── Data Feeds ───────────────────────────────────────────────
 BINANCE_API_URL = "https://api.binance.com/api/v3"
 OPEN_METEO_API_URL = "https://api.open-meteo.com/v1"
+# Binance response TTLs (seconds) — markets analyzed in one scan share fetches
+BTC_PRICE_CACHE_TTL = 2
+BTC_KLINES_CACHE_TTL = 10
+BTC_TRADES_CACHE_TTL = 3
 
 # ─── Logging ──────────────────────────────────────────────────
 LOG_DIR = os.getenv("LOG_DIR", "logs")
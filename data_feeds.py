@@ -4,9 +4,15 @@
 BTC price data from Binance. Weather data from Open-Meteo.
 """
 
+import functools
+import json
 import logging
+import re
+import time
 import requests
 import numpy as np
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -14,6 +20,65 @@ import config
 
 logger = logging.getLogger("polly.feeds")
 
+# orjson parses Binance's kline/trade payloads several times faster
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# openmeteo_requests decodes Open-Meteo's FlatBuffers responses straight into
+# float32 arrays; without it forecasts come from the JSON API
+try:
+    import openmeteo_requests
+    HAS_OPENMETEO = True
+except ImportError:
+    HAS_OPENMETEO = False
+
+# aiohttp lets forecast requests for many cities overlap
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+def _parse_json(resp):
+    """Decode a response body, with orjson when it's installed."""
+    return orjson.loads(resp.content) if HAS_ORJSON else resp.json()
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_token_ids(raw: str) -> tuple:
+    """Decode a market's clobTokenIds JSON string (cached: markets repeat every scan)."""
+    try:
+        return tuple(orjson.loads(raw) if HAS_ORJSON else json.loads(raw))
+    except Exception:
+        return ()
+
+
+def _ttl_cached(ttl: float):
+    """
+    Cache a feed method's successful results per (args, kwargs) for `ttl`
+    seconds. Cached objects are shared by reference — callers must not
+    mutate them. Failed fetches (None) are never cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = func(self, *args, **kwargs)
+            if value is not None:
+                self._cache[key] = (now, value)
+            return value
+        return wrapper
+    return decorator
+
 
 # ═══════════════════════════════════════════════════════════════
 #  BTC Price Feed (Binance public API — no key needed)
@@ -24,36 +89,47 @@ class BTCFeed:
 
     def __init__(self):
         self.base_url = config.BINANCE_API_URL
+        # One pooled keep-alive session, so each call skips DNS + TLS setup
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self._cache: dict = {}  # (method, args, kwargs) -> (monotonic ts, result)
 
+    @_ttl_cached(config.BTC_PRICE_CACHE_TTL)
     def get_current_price(self) -> Optional[float]:
         """Get current BTC/USDT price."""
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.base_url}/ticker/price",
                 params={"symbol": "BTCUSDT"},
                 timeout=10,
             )
             resp.raise_for_status()
-            return float(resp.json()["price"])
+            return float(_parse_json(resp)["price"])
         except Exception as e:
             logger.error(f"BTC price fetch error: {e}")
             return None
 
-    def get_klines(self, interval: str = "1m", limit: int = 100) -> Optional[np.ndarray]:
+    @_ttl_cached(config.BTC_KLINES_CACHE_TTL)
+    def get_klines(self, interval: str = "1m", limit: int = 100) -> Optional[dict]:
         """
-        Fetch OHLCV klines. Returns numpy array with columns:
-        [open_time, open, high, low, close, volume, close_time,
-         quote_volume, trades, taker_buy_base, taker_buy_quote, ignore]
+        Fetch OHLCV klines. Returns the columns the indicators use as
+        contiguous float32 arrays: {"high", "low", "close", "volume"}.
         """
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.base_url}/klines",
                 params={"symbol": "BTCUSDT", "interval": interval, "limit": limit},
                 timeout=15,
             )
             resp.raise_for_status()
-            data = resp.json()
-            return np.array(data, dtype=float)
+            data = _parse_json(resp)
+            n = len(data)
+            return {
+                "high": np.fromiter((float(r[2]) for r in data), np.float32, n),
+                "low": np.fromiter((float(r[3]) for r in data), np.float32, n),
+                "close": np.fromiter((float(r[4]) for r in data), np.float32, n),
+                "volume": np.fromiter((float(r[5]) for r in data), np.float32, n),
+            }
         except Exception as e:
             logger.error(f"BTC klines error: {e}")
             return None
@@ -61,27 +137,36 @@ class BTCFeed:
     def get_ticker_24h(self) -> Optional[dict]:
         """Get 24h ticker stats."""
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.base_url}/ticker/24hr",
                 params={"symbol": "BTCUSDT"},
                 timeout=10,
             )
             resp.raise_for_status()
-            return resp.json()
+            return _parse_json(resp)
         except Exception as e:
             logger.error(f"BTC 24h ticker error: {e}")
             return None
 
-    def get_recent_trades(self, limit: int = 100) -> Optional[list]:
-        """Get recent trades for order flow analysis."""
+    @_ttl_cached(config.BTC_TRADES_CACHE_TTL)
+    def get_recent_trades(self, limit: int = 100) -> Optional[dict]:
+        """
+        Get recent trades for order flow analysis. Returns the two fields
+        it uses as arrays: {"qty": float32, "is_buyer_maker": bool}.
+        """
         try:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.base_url}/trades",
                 params={"symbol": "BTCUSDT", "limit": limit},
                 timeout=10,
             )
             resp.raise_for_status()
-            return resp.json()
+            data = _parse_json(resp)
+            n = len(data)
+            return {
+                "qty": np.fromiter((float(t["qty"]) for t in data), np.float32, n),
+                "is_buyer_maker": np.fromiter((t["isBuyerMaker"] for t in data), np.bool_, n),
+            }
         except Exception as e:
             logger.error(f"BTC trades error: {e}")
             return None
@@ -91,16 +176,39 @@ class BTCFeed:
 #  Weather Feed (Open-Meteo — free, no API key)
 # ═══════════════════════════════════════════════════════════════
 
+@dataclass(slots=True)
+class TemperatureForecast:
+    """Hourly temperature forecast as parallel arrays."""
+    times: np.ndarray    # datetime64[h], UTC
+    temps_c: np.ndarray  # float32, °C
+
+
+@dataclass(slots=True)
+class PrecipForecast:
+    """Hourly precipitation forecast as parallel arrays."""
+    times: np.ndarray        # datetime64[h], UTC
+    probability: np.ndarray  # float32, percent
+    amount_mm: np.ndarray    # float32
+
+
+@dataclass(slots=True)
+class SnowForecast:
+    """Hourly snowfall forecast as parallel arrays."""
+    times: np.ndarray        # datetime64[h], UTC
+    snowfall_cm: np.ndarray  # float32
+
+
 class WeatherFeed:
     """Fetch weather forecasts from Open-Meteo API."""
 
     def __init__(self):
         self.base_url = config.OPEN_METEO_API_URL
+        self._om = openmeteo_requests.Client() if HAS_OPENMETEO else None
 
-    def get_forecast(self, latitude: float, longitude: float,
-                     hourly_vars: list = None) -> Optional[dict]:
+    @staticmethod
+    def _forecast_params(latitude: float, longitude: float, hourly_vars: list = None) -> dict:
         """
-        Get weather forecast for a location.
+        Query parameters for a forecast request.
         Default hourly variables: temperature, precipitation, wind, humidity.
         """
         if hourly_vars is None:
@@ -113,16 +221,21 @@ class WeatherFeed:
                 "snowfall",
                 "weathercode",
             ]
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": ",".join(hourly_vars),
+            "forecast_days": 3,
+            "timezone": "UTC",
+        }
+
+    def get_forecast(self, latitude: float, longitude: float,
+                     hourly_vars: list = None) -> Optional[dict]:
+        """Get weather forecast for a location."""
         try:
             resp = requests.get(
                 f"{self.base_url}/forecast",
-                params={
-                    "latitude": latitude,
-                    "longitude": longitude,
-                    "hourly": ",".join(hourly_vars),
-                    "forecast_days": 3,
-                    "timezone": "UTC",
-                },
+                params=self._forecast_params(latitude, longitude, hourly_vars),
                 timeout=15,
             )
             resp.raise_for_status()
@@ -131,32 +244,143 @@ class WeatherFeed:
             logger.error(f"Weather forecast error: {e}")
             return None
 
-    def get_temperature_forecast(self, latitude: float, longitude: float,
-                                  hours_ahead: int = 48) -> Optional[list]:
-        """Get temperature forecast as list of (time, temp_celsius) tuples."""
-        data = self.get_forecast(latitude, longitude, ["temperature_2m"])
-        if not data or "hourly" not in data:
+    def get_hourly(self, latitude: float, longitude: float,
+                   hourly_vars: list) -> Optional[tuple[np.ndarray, list]]:
+        """
+        Hourly forecast as arrays: (datetime64[h] UTC times, one float32
+        array per variable in `hourly_vars` order). Decoded zero-copy from
+        FlatBuffers when openmeteo_requests is installed, else from JSON.
+        """
+        if self._om is None:
+            return self._hourly_from_json(self.get_forecast(latitude, longitude, hourly_vars),
+                                          hourly_vars)
+        try:
+            response = self._om.weather_api(
+                f"{self.base_url}/forecast",
+                params=self._forecast_params(latitude, longitude, hourly_vars),
+                timeout=15,
+            )[0]
+            hourly = response.Hourly()
+            times = np.arange(hourly.Time(), hourly.TimeEnd(), hourly.Interval(),
+                              dtype=np.int64).astype("datetime64[s]").astype("datetime64[h]")
+            return times, [hourly.Variables(i).ValuesAsNumpy() for i in range(len(hourly_vars))]
+        except Exception as e:
+            logger.error(f"Weather forecast error: {e}")
             return None
-        times = data["hourly"].get("time", [])[:hours_ahead]
-        temps = data["hourly"].get("temperature_2m", [])[:hours_ahead]
-        return list(zip(times, temps))
+
+    def get_temperature_forecast(self, latitude: float, longitude: float,
+                                  hours_ahead: int = 48) -> Optional[TemperatureForecast]:
+        """Get hourly temperature forecast (°C) for the next `hours_ahead` hours."""
+        hourly = self.get_hourly(latitude, longitude, ["temperature_2m"])
+        return self._temperature_from(hourly, hours_ahead)
 
     def get_precipitation_forecast(self, latitude: float, longitude: float,
-                                    hours_ahead: int = 48) -> Optional[list]:
-        """Get precipitation probability forecast."""
-        data = self.get_forecast(
+                                    hours_ahead: int = 48) -> Optional[PrecipForecast]:
+        """Get hourly precipitation probability and amount forecast."""
+        hourly = self.get_hourly(
             latitude, longitude,
             ["precipitation_probability", "precipitation"]
         )
+        return self._precipitation_from(hourly, hours_ahead)
+
+    def get_snowfall_forecast(self, latitude: float, longitude: float,
+                              hours_ahead: int = 48) -> Optional[SnowForecast]:
+        """Get hourly snowfall forecast (cm)."""
+        hourly = self.get_hourly(latitude, longitude, ["snowfall"])
+        return self._snowfall_from(hourly, hours_ahead)
+
+    # ── Async forecasts (one aiohttp session per batch) ──────
+
+    @staticmethod
+    def aio_session() -> "aiohttp.ClientSession":
+        """A pooled aiohttp session for one batch of async forecast requests."""
+        return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+
+    async def aget_forecast(self, latitude: float, longitude: float,
+                            hourly_vars: list = None,
+                            session: "aiohttp.ClientSession" = None) -> Optional[dict]:
+        """Async get_forecast. Pass a shared `session` when fetching many locations."""
+        if session is None:
+            async with self.aio_session() as session:
+                return await self.aget_forecast(latitude, longitude, hourly_vars, session)
+        try:
+            async with session.get(
+                f"{self.base_url}/forecast",
+                params=self._forecast_params(latitude, longitude, hourly_vars),
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+        except Exception as e:
+            logger.error(f"Weather forecast error: {e}")
+            return None
+
+    async def aget_temperature_forecast(self, latitude: float, longitude: float,
+                                        hours_ahead: int = 48,
+                                        session: "aiohttp.ClientSession" = None
+                                        ) -> Optional[TemperatureForecast]:
+        """Async get_temperature_forecast."""
+        hourly_vars = ["temperature_2m"]
+        data = await self.aget_forecast(latitude, longitude, hourly_vars, session)
+        return self._temperature_from(self._hourly_from_json(data, hourly_vars), hours_ahead)
+
+    async def aget_precipitation_forecast(self, latitude: float, longitude: float,
+                                          hours_ahead: int = 48,
+                                          session: "aiohttp.ClientSession" = None
+                                          ) -> Optional[PrecipForecast]:
+        """Async get_precipitation_forecast."""
+        hourly_vars = ["precipitation_probability", "precipitation"]
+        data = await self.aget_forecast(latitude, longitude, hourly_vars, session)
+        return self._precipitation_from(self._hourly_from_json(data, hourly_vars), hours_ahead)
+
+    async def aget_snowfall_forecast(self, latitude: float, longitude: float,
+                                     hours_ahead: int = 48,
+                                     session: "aiohttp.ClientSession" = None
+                                     ) -> Optional[SnowForecast]:
+        """Async get_snowfall_forecast."""
+        hourly_vars = ["snowfall"]
+        data = await self.aget_forecast(latitude, longitude, hourly_vars, session)
+        return self._snowfall_from(self._hourly_from_json(data, hourly_vars), hours_ahead)
+
+    # ── Response parsing ─────────────────────────────────────
+
+    @staticmethod
+    def _hourly_from_json(data: Optional[dict], hourly_vars: list) -> Optional[tuple[np.ndarray, list]]:
+        """get_hourly's (times, arrays) from a JSON forecast response."""
         if not data or "hourly" not in data:
             return None
-        times = data["hourly"].get("time", [])[:hours_ahead]
-        probs = data["hourly"].get("precipitation_probability", [])[:hours_ahead]
-        amounts = data["hourly"].get("precipitation", [])[:hours_ahead]
-        return [
-            {"time": t, "probability": p, "amount_mm": a}
-            for t, p, a in zip(times, probs, amounts)
-        ]
+        hourly = data["hourly"]
+        return (
+            np.array(hourly.get("time", []), dtype="datetime64[h]"),
+            [np.array(hourly.get(var, []), dtype=np.float32) for var in hourly_vars],
+        )
+
+    @staticmethod
+    def _temperature_from(hourly: Optional[tuple], hours_ahead: int) -> Optional[TemperatureForecast]:
+        """First `hours_ahead` hours of a temperature_2m forecast."""
+        if hourly is None:
+            return None
+        times, (temps,) = hourly
+        return TemperatureForecast(times=times[:hours_ahead], temps_c=temps[:hours_ahead])
+
+    @staticmethod
+    def _precipitation_from(hourly: Optional[tuple], hours_ahead: int) -> Optional[PrecipForecast]:
+        """First `hours_ahead` hours of a precipitation forecast."""
+        if hourly is None:
+            return None
+        times, (probs, amounts) = hourly
+        return PrecipForecast(
+            times=times[:hours_ahead],
+            probability=probs[:hours_ahead],
+            amount_mm=amounts[:hours_ahead],
+        )
+
+    @staticmethod
+    def _snowfall_from(hourly: Optional[tuple], hours_ahead: int) -> Optional[SnowForecast]:
+        """First `hours_ahead` hours of a snowfall forecast."""
+        if hourly is None:
+            return None
+        times, (snowfall,) = hourly
+        return SnowForecast(times=times[:hours_ahead], snowfall_cm=snowfall[:hours_ahead])
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -187,10 +411,15 @@ CITY_COORDS = {
 }
 
 
+# Whole-word city names, longest first, so "la" can't match inside "dallas"
+_CITY_RE = re.compile(
+    r"\b(" + "|".join(re.escape(c) for c in sorted(CITY_COORDS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def find_city_coords(text: str) -> Optional[tuple]:
-    """Try to extract city coordinates from market text."""
-    text_lower = text.lower()
-    for city, coords in CITY_COORDS.items():
-        if city in text_lower:
-            return coords
-    return None
+    """Try to extract city coordinates from market text (cached: markets repeat every scan)."""
+    m = _CITY_RE.search(text)
+    return CITY_COORDS[m.group(1).lower()] if m else None
@@ -0,0 +1,25 @@
+"""
+🦜 Poly Wants A Cracker — JIT Helpers
+=======================================
+Optional Numba compilation for the numeric hot paths.
+Without numba installed, @njit functions simply run as plain Python.
+"""
+
+import logging
+
+logger = logging.getLogger("polly.jit")
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.warning("numba not installed — JIT kernels will run as plain Python")
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit; supports both @njit and @njit(...)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
@@ -5,11 +5,19 @@ Wrapper around the Polymarket CLOB API and Gamma markets API.
 Handles both read-only operations and authenticated trading.
 """
 
+import asyncio
+import json
 import logging
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Optional
+from urllib3.util.retry import Retry
 
 import config
+from data_feeds import parse_token_ids
 
 logger = logging.getLogger("polly.polymarket")
 
@@ -25,14 +33,55 @@ except ImportError:
     HAS_CLOB_CLIENT = False
     logger.warning("py-clob-client not installed — running in REST-only mode")
 
+# aiohttp lets many CLOB price reads share one round-trip of wall time
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# websockets streams CLOB book updates so prices needn't be polled
+try:
+    import websockets
+    HAS_WEBSOCKETS = True
+except ImportError:
+    HAS_WEBSOCKETS = False
+
+# Market discovery: Gamma search terms, and the text that marks a BTC 15-min market
+_BTC_QUERIES = ("btc", "bitcoin")
+_BTC_KEYWORDS = ("15 min", "15-min", "15min", "minute")
+_WEATHER_QUERIES = ("weather", "temperature", "hurricane", "rain", "snow", "storm",
+                    "heat", "cold", "tornado", "flood", "climate")
+
 
 class PolymarketClient:
     """Unified Polymarket interface: Gamma API for discovery, CLOB for trading."""
 
     def __init__(self):
         self.gamma_url = config.POLYMARKET_GAMMA_API
+        # One pooled keep-alive session for all Gamma calls, retrying
+        # rate limits and transient 5xx with backoff
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._http.headers.update({"Accept": "application/json", "User-Agent": "polly/1.0"})
+        self._cache: dict[tuple, tuple[float, object]] = {}  # key -> (monotonic ts, data)
         self._clob: Optional[object] = None
         self._authenticated = False
+        # Streamed midpoints (token_id -> mid), written by the stream thread
+        self._mid: dict[str, float] = {}
+        self._stream_ids: set[str] = set()  # guarded by _stream_lock
+        self._stream_lock = threading.Lock()
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stream_ws = None
+        self._stream_stop = threading.Event()
 
         if HAS_CLOB_CLIENT and config.POLYMARKET_PRIVATE_KEY:
             try:
@@ -56,6 +105,41 @@ class PolymarketClient:
     def is_authenticated(self) -> bool:
         return self._authenticated
 
+    # ── Response cache ───────────────────────────────────────
+
+    def _cache_lookup(self, key: tuple, ttl: float):
+        """Return a cached value younger than `ttl` seconds, else None."""
+        hit = self._cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        return None
+
+    def _cached_get(self, path: str, params: dict, ttl: float):
+        """GET a Gamma endpoint, serving repeats within `ttl` seconds from memory."""
+        key = (path, tuple(sorted(params.items())))
+        data = self._cache_lookup(key, ttl)
+        if data is None:
+            resp = self._http.get(f"{self.gamma_url}{path}", params=params, timeout=15)
+            resp.raise_for_status()
+            data = resp.json()
+            self._cache[key] = (time.monotonic(), data)
+        return data
+
+    def invalidate(self):
+        """Drop all cached responses (e.g. after placing a trade)."""
+        self._cache.clear()
+
+    def close(self):
+        """Stop the price stream and release pooled HTTP connections."""
+        self.stop_stream()
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     # ── Gamma Markets API (discovery) ────────────────────────
 
     def get_markets(self, limit=100, offset=0, active=True, closed=False,
@@ -67,9 +151,7 @@ class PolymarketClient:
         if query:
             params["slug_contains"] = query
         try:
-            resp = requests.get(f"{self.gamma_url}/markets", params=params, timeout=15)
-            resp.raise_for_status()
-            return resp.json()
+            return self._cached_get("/markets", params, config.GAMMA_MARKETS_CACHE_TTL)
         except Exception as e:
             logger.error(f"Gamma API error: {e}")
             return []
@@ -80,62 +162,90 @@ class PolymarketClient:
         if query:
             params["slug_contains"] = query
         try:
-            resp = requests.get(f"{self.gamma_url}/events", params=params, timeout=15)
-            resp.raise_for_status()
-            return resp.json()
+            return self._cached_get("/events", params, config.GAMMA_EVENTS_CACHE_TTL)
         except Exception as e:
             logger.error(f"Gamma events error: {e}")
             return []
 
+    def _search_markets(self, queries: tuple) -> list:
+        """
+        Run one Gamma market search per query concurrently over the pooled
+        session. Returns the result lists in query order.
+        """
+        workers = min(config.GAMMA_MAX_WORKERS, len(queries))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(lambda q: self.get_markets(limit=50, query=q), queries))
+
     def find_btc_markets(self) -> list:
         """Find active BTC 15-minute window markets."""
-        markets = []
-        for query in ["btc", "bitcoin"]:
-            results = self.get_markets(limit=50, query=query)
-            for m in results:
-                q = (m.get("question", "") + " " + m.get("description", "")).lower()
-                if any(kw in q for kw in ["15 min", "15-min", "15min", "minute"]):
-                    if m.get("active") and not m.get("closed"):
-                        markets.append(m)
-        # Deduplicate by id
         seen = set()
         unique = []
-        for m in markets:
-            if m["id"] not in seen:
-                seen.add(m["id"])
-                unique.append(m)
+        for results in self._search_markets(_BTC_QUERIES):
+            for m in results:
+                # Active, not yet seen (dedup by id), and a 15-minute window
+                if not m.get("active") or m.get("closed") or m["id"] in seen:
+                    continue
+                q = (m.get("question", "") + " " + m.get("description", "")).lower()
+                if any(kw in q for kw in _BTC_KEYWORDS):
+                    seen.add(m["id"])
+                    unique.append(m)
         return unique
 
     def find_weather_markets(self) -> list:
         """Find active weather-related markets."""
-        markets = []
-        for query in ["weather", "temperature", "hurricane", "rain", "snow", "storm",
-                       "heat", "cold", "tornado", "flood", "climate"]:
-            results = self.get_markets(limit=50, query=query)
-            for m in results:
-                if m.get("active") and not m.get("closed"):
-                    markets.append(m)
         seen = set()
         unique = []
-        for m in markets:
-            if m["id"] not in seen:
-                seen.add(m["id"])
-                unique.append(m)
+        for results in self._search_markets(_WEATHER_QUERIES):
+            for m in results:
+                if m.get("active") and not m.get("closed") and m["id"] not in seen:
+                    seen.add(m["id"])
+                    unique.append(m)
         return unique
 
     # ── CLOB API (pricing & trading) ─────────────────────────
 
     def get_midpoint(self, token_id: str) -> Optional[float]:
-        """Get midpoint price for a token."""
+        """Get midpoint price for a token (streamed if subscribed, else REST)."""
+        mid = self._mid.get(token_id)
+        if mid is not None:
+            return mid
+        key = ("midpoint", token_id)
+        cached = self._cache_lookup(key, config.CLOB_MIDPOINT_CACHE_TTL)
+        if cached is not None:
+            return cached
         if not self._clob:
             return None
         try:
             mid = self._clob.get_midpoint(token_id)
-            return float(mid) if mid else None
+            if not mid:
+                return None
+            mid = float(mid)
+            self._cache[key] = (time.monotonic(), mid)
+            return mid
         except Exception as e:
             logger.error(f"Midpoint error: {e}")
             return None
 
+    def get_midpoints(self, token_ids: list) -> dict:
+        """
+        Get midpoints for many tokens in one batched CLOB request.
+        Returns {token_id: midpoint}; tokens without a midpoint are omitted.
+        """
+        if not self._clob or not token_ids:
+            return {}
+        try:
+            mids = self._clob.get_midpoints([BookParams(token_id=t) for t in token_ids])
+        except Exception as e:
+            logger.error(f"Midpoints error: {e}")
+            return {}
+        now = time.monotonic()
+        result = {}
+        for token_id, mid in (mids or {}).items():
+            if mid:
+                result[token_id] = float(mid)
+                self._cache[("midpoint", token_id)] = (now, result[token_id])
+        return result
+
     def get_price(self, token_id: str, side: str = "BUY") -> Optional[float]:
         """Get best price for a side."""
         if not self._clob:
@@ -163,23 +273,206 @@ class PolymarketClient:
         try:
             prices = market.get("outcomePrices", "")
             if isinstance(prices, str) and prices:
-                import json
                 prices = json.loads(prices)
             if isinstance(prices, list) and len(prices) >= 1:
                 return float(prices[0])
         except Exception:
             pass
         # Try via CLOB
+        token_id = self._yes_token_id(market)
+        if token_id is None:
+            return None
+        return self.get_midpoint(token_id)
+
+    @staticmethod
+    def _has_outcome_prices(market: dict) -> bool:
+        """Whether get_market_probability can answer without the CLOB."""
+        prices = market.get("outcomePrices", "")
+        if isinstance(prices, str):
+            return bool(prices)
+        return isinstance(prices, list) and len(prices) >= 1
+
+    @staticmethod
+    def _yes_token_id(market: dict) -> Optional[str]:
+        """First (YES) CLOB token ID of a market, if it has one."""
         token_ids = market.get("clobTokenIds", "")
         if isinstance(token_ids, str) and token_ids:
-            import json
+            token_ids = parse_token_ids(token_ids)
+        if isinstance(token_ids, (list, tuple)) and len(token_ids) >= 1:
+            return token_ids[0]
+        return None
+
+    def prefetch_midpoints(self, markets: list):
+        """
+        Warm the midpoint cache for every market that will need the CLOB
+        fallback, with one batched request, so the per-market
+        get_market_probability calls that follow are dict lookups.
+        """
+        token_ids = []
+        for m in markets:
+            if not self._has_outcome_prices(m):
+                token_id = self._yes_token_id(m)
+                if token_id is not None:
+                    token_ids.append(token_id)
+        if not token_ids:
+            return
+        if config.CLOB_WS_ENABLED and self.start_stream(token_ids):
+            # Streamed tokens are served from self._mid; fetch the rest
+            token_ids = [t for t in token_ids if t not in self._mid]
+            if not token_ids:
+                return
+        if self._clob:
+            self.get_midpoints(token_ids)
+        elif HAS_AIOHTTP:
+            # REST-only mode: read the public midpoint endpoint concurrently
+            asyncio.run(self.aget_midpoints(token_ids))
+
+    # ── CLOB WebSocket price stream ──────────────────────────
+
+    def start_stream(self, token_ids: list) -> bool:
+        """
+        Subscribe to live book updates for `token_ids` on the CLOB market
+        channel. The first call starts a background thread that keeps one
+        websocket open and maintains self._mid; later calls add any new
+        tokens to the running subscription. Returns False if streaming
+        is unavailable.
+        """
+        if not HAS_WEBSOCKETS:
+            return False
+        with self._stream_lock:
+            new_ids = [t for t in token_ids if t not in self._stream_ids]
+            if not new_ids:
+                return True
+            self._stream_ids.update(new_ids)
+
+        if self._stream_thread is None or not self._stream_thread.is_alive():
+            self._stream_stop.clear()
+            self._stream_thread = threading.Thread(
+                target=self._run_stream, name="clob-stream", daemon=True
+            )
+            self._stream_thread.start()
+        elif self._stream_loop is not None and self._stream_ws is not None:
+            msg = json.dumps({"assets_ids": new_ids, "operation": "subscribe"})
+            asyncio.run_coroutine_threadsafe(self._stream_ws.send(msg), self._stream_loop)
+        return True
+
+    def stop_stream(self):
+        """Close the price stream and forget streamed prices."""
+        self._stream_stop.set()
+        if self._stream_loop is not None and self._stream_ws is not None:
+            asyncio.run_coroutine_threadsafe(self._stream_ws.close(), self._stream_loop)
+        if self._stream_thread is not None:
+            self._stream_thread.join(timeout=5)
+            self._stream_thread = None
+        with self._stream_lock:
+            self._stream_ids.clear()
+        self._mid.clear()
+
+    def _run_stream(self):
+        """Stream thread entry point: own an event loop for the websocket."""
+        self._stream_loop = asyncio.new_event_loop()
+        try:
+            self._stream_loop.run_until_complete(self._stream_forever())
+        finally:
+            self._stream_loop.close()
+            self._stream_loop = None
+
+    async def _stream_forever(self):
+        """Keep the market channel open, reconnecting with exponential backoff."""
+        backoff = 1.0
+        while not self._stream_stop.is_set():
             try:
-                token_ids = json.loads(token_ids)
-            except Exception:
+                async with websockets.connect(
+                    config.POLYMARKET_WS_URL,
+                    ping_interval=config.CLOB_WS_HEARTBEAT_SECONDS,
+                    ping_timeout=config.CLOB_WS_HEARTBEAT_SECONDS,
+                ) as ws:
+                    self._stream_ws = ws
+                    with self._stream_lock:
+                        asset_ids = list(self._stream_ids)
+                    await ws.send(json.dumps({"assets_ids": asset_ids, "type": "market"}))
+                    logger.info(f"📡 Streaming {len(asset_ids)} CLOB books")
+                    backoff = 1.0
+                    async for raw in ws:
+                        self._on_stream_message(raw)
+            except Exception as e:
+                if self._stream_stop.is_set():
+                    break
+                logger.warning(f"CLOB stream dropped: {e} — reconnecting in {backoff:.0f}s")
+            finally:
+                self._stream_ws = None
+                # Prices go stale while disconnected; fall back to REST
+                self._mid.clear()
+            if self._stream_stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, config.CLOB_WS_MAX_BACKOFF_SECONDS)
+
+    def _on_stream_message(self, raw):
+        """Update self._mid from a market-channel book or price_change event."""
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return  # heartbeat replies and other non-JSON frames
+        for event in data if isinstance(data, list) else (data,):
+            kind = event.get("event_type")
+            if kind == "book":
+                bids = [float(b["price"]) for b in event.get("bids", ())]
+                asks = [float(a["price"]) for a in event.get("asks", ())]
+                if bids and asks:
+                    self._mid[event["asset_id"]] = (max(bids) + min(asks)) / 2
+            elif kind == "price_change":
+                for change in event.get("price_changes", ()):
+                    bid, ask = change.get("best_bid"), change.get("best_ask")
+                    if bid and ask:
+                        self._mid[change["asset_id"]] = (float(bid) + float(ask)) / 2
+
+    # ── Async CLOB pricing ───────────────────────────────────
+
+    def _aio_session(self) -> "aiohttp.ClientSession":
+        """
+        A pooled aiohttp session for one batch. Sessions are tied to the
+        event loop that made them, and each sync caller runs its own loop,
+        so a batch opens one, shares it across its requests, and closes it.
+        """
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60),
+            headers={"Accept": "application/json", "User-Agent": "polly/1.0"},
+            timeout=aiohttp.ClientTimeout(total=15),
+        )
+
+    async def aget_midpoint(self, token_id: str,
+                            session: "aiohttp.ClientSession" = None) -> Optional[float]:
+        """Async get_midpoint via the public CLOB REST endpoint (shares the midpoint cache)."""
+        key = ("midpoint", token_id)
+        cached = self._cache_lookup(key, config.CLOB_MIDPOINT_CACHE_TTL)
+        if cached is not None:
+            return cached
+        if session is None:
+            async with self._aio_session() as session:
+                return await self.aget_midpoint(token_id, session)
+        try:
+            async with session.get(f"{config.POLYMARKET_HOST}/midpoint",
+                                   params={"token_id": token_id}) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+            mid = data.get("mid") if isinstance(data, dict) else None
+            if not mid:
                 return None
-        if isinstance(token_ids, list) and len(token_ids) >= 1:
-            return self.get_midpoint(token_ids[0])
-        return None
+            mid = float(mid)
+            self._cache[key] = (time.monotonic(), mid)
+            return mid
+        except Exception as e:
+            logger.error(f"Async midpoint error: {e}")
+            return None
+
+    async def aget_midpoints(self, token_ids: list) -> dict:
+        """
+        Fetch many midpoints concurrently with asyncio.gather over one
+        session. Returns {token_id: midpoint}; misses are omitted.
+        """
+        async with self._aio_session() as session:
+            mids = await asyncio.gather(*(self.aget_midpoint(t, session) for t in token_ids))
+        return {t: mid for t, mid in zip(token_ids, mids) if mid is not None}
 
     # ── Order Execution ──────────────────────────────────────
 
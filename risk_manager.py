@@ -4,19 +4,55 @@
 Kelly criterion, bankroll management, and position tracking.
 """
 
+import atexit
 import json
 import logging
 import os
-from datetime import datetime, timezone
-from dataclasses import dataclass, field, asdict
+import time
+from dataclasses import dataclass, field
 from typing import Optional
+import numpy as np
 
 import config
 
 logger = logging.getLogger("polly.risk")
 
+# orjson encodes state/trade records several times faster; stdlib json works too
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+
+def _dumps(obj) -> bytes:
+    """Compact JSON bytes (numpy scalars from the strategies included)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":"), default=lambda o: o.item()).encode()
+
+
+_loads = orjson.loads if HAS_ORJSON else json.loads
+
+_iso_second = (None, "")  # (unix second, "YYYY-MM-DDTHH:MM:SS") of the last call
+
+
+def _utcnow_iso() -> str:
+    """
+    Current UTC time as ISO-8601 with microseconds and +00:00, like
+    datetime.now(timezone.utc).isoformat() but without building a datetime;
+    the date/time part is formatted at most once per second.
+    """
+    global _iso_second
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _iso_second
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_second = (sec, prefix)
+    return f"{prefix}.{ns // 1000:06d}+00:00"
+
+
+@dataclass(slots=True)
 class Position:
     market_id: str
     market_question: str
@@ -36,7 +72,19 @@ class Position:
 
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.now(timezone.utc).isoformat()
+            self.timestamp = _utcnow_iso()
+
+    @property
+    def key(self) -> str:
+        """
+        Store key: market id plus open timestamp. The market id alone isn't
+        unique — the bot can re-enter a market, and closed positions keep theirs.
+        """
+        return f"{self.market_id}@{self.timestamp}"
+
+    def to_dict(self) -> dict:
+        """Shallow field dict — same as asdict() for this flat dataclass, minus the deep copy."""
+        return {f: getattr(self, f) for f in self.__slots__}
 
 
 class RiskManager:
@@ -47,9 +95,36 @@ class RiskManager:
 
     def __init__(self, bankroll: float = None):
         self.bankroll = bankroll or config.INITIAL_BANKROLL
-        self.positions: list[Position] = []
+        self.positions: dict[str, Position] = {}  # Position.key -> Position
         self.trade_history: list[dict] = []
         self._load_state()
+        self._rebuild_counters()
+
+        # One long-lived append handle for the trade log; unbuffered, so each
+        # record is a single write() that's on disk as soon as it returns
+        os.makedirs(config.LOG_DIR, exist_ok=True)
+        self._trade_log_fh = open(config.TRADE_LOG_FILE, "ab", buffering=0)
+        atexit.register(self._trade_log_fh.close)
+
+    def _rebuild_counters(self):
+        """
+        Derive the running aggregates from positions/trade_history once,
+        so bet sizing and stats never rescan the full history.
+        """
+        self._open_positions: dict[str, Position] = {
+            k: p for k, p in self.positions.items() if p.status == "open"
+        }
+        self._total_exposure = sum(p.size_usd for p in self._open_positions.values())
+        self._closed_count = sum(1 for p in self.positions.values() if p.status == "closed")
+        pnls = [t.get("pnl", 0) for t in self.trade_history]
+        self._total_pnl = sum(pnls)
+        self._wins = sum(1 for pnl in pnls if pnl > 0)
+        self._losses = len(pnls) - self._wins
+
+    @property
+    def open_positions(self) -> list[Position]:
+        """Currently open positions, oldest first."""
+        return list(self._open_positions.values())
 
     # ── Kelly Criterion ──────────────────────────────────────
 
@@ -68,34 +143,39 @@ class RiskManager:
           q = 1 - p
 
         We use fractional Kelly (half-Kelly by default) for safety.
+        Invalid prices or no edge size to 0. Computed by kelly_size_vec,
+        so the scalar and batch paths share one formula.
+        """
+        return float(RiskManager.kelly_size_vec(our_prob, market_prob, fraction))
+
+    @staticmethod
+    def kelly_size_vec(our_probs, market_probs, fraction: float = None) -> np.ndarray:
+        """
+        kelly_size over arrays of candidate markets at once, for sizing many
+        markets without a Python-level loop.
         """
         if fraction is None:
             fraction = config.KELLY_FRACTION
 
-        if market_prob <= 0 or market_prob >= 1 or our_prob <= 0 or our_prob >= 1:
-            return 0.0
+        p = np.asarray(our_probs, dtype=np.float64)
+        m = np.asarray(market_probs, dtype=np.float64)
+        valid = (m > 0) & (m < 1) & (p > 0) & (p < 1)
 
-        b = (1.0 / market_prob) - 1.0  # net odds
-        if b <= 0:
-            return 0.0
-
-        p = our_prob
-        q = 1.0 - p
-        kelly_full = (p * b - q) / b
-
-        if kelly_full <= 0:
-            return 0.0  # No edge — don't bet
-
-        return kelly_full * fraction
+        b = np.where(valid, 1.0 / np.where(valid, m, 1.0) - 1.0, 0.0)  # net odds
+        kelly_full = np.divide(p * b - (1.0 - p), b, out=np.zeros_like(b), where=b > 0)
+        return np.maximum(kelly_full, 0.0) * fraction
 
     # ── Bet Sizing ───────────────────────────────────────────
 
     def calculate_bet_size(self, our_prob: float, market_prob: float,
-                           strategy: str = "") -> tuple[float, float, str]:
+                           strategy: str = "",
+                           kelly: Optional[float] = None) -> tuple[float, float, str]:
         """
         Calculate recommended bet size in USD.
         Returns (bet_size_usd, kelly_fraction, rejection_reason).
         rejection_reason is empty string if bet is approved.
+        Pass `kelly` when it was already computed (e.g. by kelly_size_vec
+        for a batch) to skip the per-call kelly_size.
         """
         edge = our_prob - market_prob
 
@@ -103,8 +183,12 @@ class RiskManager:
         if edge < config.MIN_EDGE_THRESHOLD:
             return 0.0, 0.0, f"Edge {edge:.3f} below threshold {config.MIN_EDGE_THRESHOLD}"
 
+        # Check open positions (O(1), so before any Kelly math)
+        if len(self._open_positions) >= config.MAX_OPEN_POSITIONS:
+            return 0.0, 0.0, f"Max open positions ({config.MAX_OPEN_POSITIONS}) reached"
+
         # Kelly sizing
-        kf = self.kelly_size(our_prob, market_prob)
+        kf = self.kelly_size(our_prob, market_prob) if kelly is None else float(kelly)
         if kf <= 0:
             return 0.0, 0.0, "Kelly says don't bet (negative EV)"
 
@@ -119,13 +203,8 @@ class RiskManager:
         if bet_usd < config.MIN_BET_SIZE_USD:
             return 0.0, kf, f"Bet size ${bet_usd:.2f} below minimum ${config.MIN_BET_SIZE_USD}"
 
-        # Check open positions
-        open_positions = [p for p in self.positions if p.status == "open"]
-        if len(open_positions) >= config.MAX_OPEN_POSITIONS:
-            return 0.0, kf, f"Max open positions ({config.MAX_OPEN_POSITIONS}) reached"
-
         # Check total exposure
-        total_exposure = sum(p.size_usd for p in open_positions)
+        total_exposure = self._total_exposure
         if total_exposure + bet_usd > self.bankroll * 0.5:
             remaining = self.bankroll * 0.5 - total_exposure
             if remaining < config.MIN_BET_SIZE_USD:
@@ -160,7 +239,9 @@ class RiskManager:
             strategy=strategy,
             reasoning=reasoning,
         )
-        self.positions.append(pos)
+        self.positions[pos.key] = pos
+        self._open_positions[pos.key] = pos
+        self._total_exposure += size_usd
         self.bankroll -= size_usd
         self._log_trade("OPEN", pos)
         self._save_state()
@@ -170,6 +251,10 @@ class RiskManager:
     def close_position(self, position: Position, exit_price: float,
                        pnl: float, reason: str = ""):
         """Close a position and update bankroll."""
+        if self._open_positions.pop(position.key, None) is not None:
+            self._total_exposure -= position.size_usd
+        if position.status != "closed":
+            self._closed_count += 1
         position.status = "closed"
         self.bankroll += position.size_usd + pnl
 
@@ -178,11 +263,17 @@ class RiskManager:
             "reason": reason,
             "exit_price": exit_price,
             "pnl": pnl,
-            "position": asdict(position),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "position": position.to_dict(),
+            "timestamp": _utcnow_iso(),
         }
         self.trade_history.append(record)
-        self._log_trade("CLOSE", position, extra={"pnl": pnl, "reason": reason})
+        self._total_pnl += pnl
+        if pnl > 0:
+            self._wins += 1
+        else:
+            self._losses += 1
+        self._log_trade("CLOSE", position,
+                        extra={"pnl": pnl, "reason": reason, "exit_price": exit_price})
         self._save_state()
         logger.info(f"📉 Closed: '{position.market_question[:50]}' — PnL: ${pnl:+.2f} ({reason})")
 
@@ -190,18 +281,14 @@ class RiskManager:
 
     def get_stats(self) -> dict:
         """Get portfolio statistics."""
-        open_pos = [p for p in self.positions if p.status == "open"]
-        closed_pos = [p for p in self.positions if p.status == "closed"]
-        total_pnl = sum(t.get("pnl", 0) for t in self.trade_history)
-        wins = sum(1 for t in self.trade_history if t.get("pnl", 0) > 0)
-        losses = sum(1 for t in self.trade_history if t.get("pnl", 0) <= 0)
+        wins, losses = self._wins, self._losses
 
         return {
             "bankroll": self.bankroll,
-            "open_positions": len(open_pos),
-            "total_exposure": sum(p.size_usd for p in open_pos),
-            "closed_trades": len(closed_pos),
-            "total_pnl": total_pnl,
+            "open_positions": len(self._open_positions),
+            "total_exposure": self._total_exposure,
+            "closed_trades": self._closed_count,
+            "total_pnl": self._total_pnl,
             "win_rate": wins / (wins + losses) if (wins + losses) > 0 else 0,
             "wins": wins,
             "losses": losses,
@@ -210,40 +297,81 @@ class RiskManager:
     # ── Persistence ──────────────────────────────────────────
 
     def _save_state(self):
-        """Save state to disk."""
+        """
+        Save a snapshot of bankroll + open positions to disk. Closed trades
+        already live in the append-only trade log, so the snapshot stays
+        O(open positions) however long the bot runs.
+        """
         os.makedirs(config.LOG_DIR, exist_ok=True)
         state = {
             "bankroll": self.bankroll,
-            "positions": [asdict(p) for p in self.positions],
-            "trade_history": self.trade_history,
+            "positions": [p.to_dict() for p in self.open_positions],
         }
         state_file = os.path.join(config.LOG_DIR, "state.json")
-        with open(state_file, "w") as f:
-            json.dump(state, f, indent=2)
+        tmp = f"{state_file}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_dumps(state))
+        os.replace(tmp, state_file)  # atomic, so a crash never leaves a truncated snapshot
 
     def _load_state(self):
-        """Load state from disk if exists."""
+        """Load state from disk if exists, replaying closed trades from the trade log."""
         state_file = os.path.join(config.LOG_DIR, "state.json")
-        if os.path.exists(state_file):
-            try:
-                with open(state_file) as f:
-                    state = json.load(f)
-                self.bankroll = state.get("bankroll", self.bankroll)
-                self.positions = [Position(**p) for p in state.get("positions", [])]
-                self.trade_history = state.get("trade_history", [])
-                logger.info(f"📂 Loaded state: bankroll=${self.bankroll:.2f}, {len(self.positions)} positions")
-            except Exception as e:
-                logger.warning(f"Could not load state: {e}")
+        if not os.path.exists(state_file):
+            return
+        try:
+            with open(state_file, "rb") as f:
+                state = _loads(f.read())
+            self.bankroll = state.get("bankroll", self.bankroll)
+            open_positions = [Position(**p) for p in state.get("positions", [])]
+        except Exception as e:
+            logger.warning(f"Could not load state: {e}")
+            return
+        # Open positions are restored even if the history replay below fails,
+        # so the next snapshot can't drop them while their stakes stay debited
+        self.positions = {p.key: p for p in open_positions}
+
+        try:
+            if "trade_history" in state:
+                # Older snapshot that still embeds the full history
+                self.trade_history = state["trade_history"]
+            else:
+                closed = self._load_closed_trades()
+                positions = [Position(**t["position"]) for t in closed] + open_positions
+                self.positions = {p.key: p for p in positions}
+                self.trade_history = closed
+        except Exception as e:
+            logger.warning(f"Could not replay closed trades: {e}")
+        logger.info(f"📂 Loaded state: bankroll=${self.bankroll:.2f}, {len(self.positions)} positions")
+
+    @staticmethod
+    def _load_closed_trades() -> list[dict]:
+        """
+        Stream the JSONL trade log and return its CLOSE records in order.
+        Unparseable lines (e.g. a record torn by a crash mid-write) are skipped.
+        """
+        closed = []
+        if not os.path.exists(config.TRADE_LOG_FILE):
+            return closed
+        with open(config.TRADE_LOG_FILE, "rb") as f:
+            for lineno, line in enumerate(f, 1):
+                if b'"CLOSE"' not in line:
+                    continue  # cheap skip for OPEN records
+                try:
+                    record = _loads(line)
+                except ValueError as e:
+                    logger.warning(f"Skipping corrupt trade log line {lineno}: {e}")
+                    continue
+                if record.get("action") == "CLOSE":
+                    closed.append(record)
+        return closed
 
     def _log_trade(self, action: str, position: Position, extra: dict = None):
         """Append trade to JSONL log."""
-        os.makedirs(config.LOG_DIR, exist_ok=True)
         record = {
             "action": action,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "position": asdict(position),
+            "timestamp": _utcnow_iso(),
+            "position": position.to_dict(),
         }
         if extra:
             record.update(extra)
-        with open(config.TRADE_LOG_FILE, "a") as f:
-            f.write(json.dumps(record) + "\n")
+        self._trade_log_fh.write(_dumps(record) + b"\n")
@@ -8,20 +8,119 @@ Edge comes from: meteorological models are quite accurate 24-48h out,
 but prediction markets often lag or misjudge weather events.
 """
 
+import asyncio
 import logging
 import re
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 
 import config
-from data_feeds import WeatherFeed, find_city_coords
+from data_feeds import HAS_AIOHTTP, HAS_OPENMETEO, WeatherFeed, find_city_coords, parse_token_ids
+from jit import njit
 
 logger = logging.getLogger("polly.weather")
 
+# Market type keywords, checked in order (plain substring alternations, so
+# e.g. "rain" still matches "rainfall" exactly as before)
+_CLASSIFIER_PATTERNS = (
+    (re.compile(r"temperature|degrees|°f|°c|hot|cold|heat|freeze", re.I), "temperature"),
+    (re.compile(r"rain|precipitation|rainfall|shower", re.I), "precipitation"),
+    (re.compile(r"snow|snowfall|blizzard|ice storm", re.I), "snow"),
+    (re.compile(r"hurricane|typhoon|cyclone", re.I), "storm"),
+    (re.compile(r"tornado|twister", re.I), "tornado"),
+    (re.compile(r"wind|gust", re.I), "wind"),
+)
+
+# Types with an analyzer. Patterns are tried in order and these come first, so
+# text matching none of their keywords can only classify as unhandled — one
+# combined scan screens such markets out before any city lookup.
+_HANDLED_TYPES = ("temperature", "precipitation", "snow")
+_WEATHER_KEYWORDS_RE = re.compile(
+    "|".join(p.pattern for p, market_type in _CLASSIFIER_PATTERNS if market_type in _HANDLED_TYPES),
+    re.I,
+)
+
+# Question parsers
+_ABOVE_RE = re.compile(r"above|over|exceed|hit|reach", re.I)
+_BELOW_RE = re.compile(r"below|under|drop", re.I)
+_TEMP_F_RE = re.compile(r"(\d+)\s*°?\s*[fF]")
+_TEMP_DEGREES_RE = re.compile(r"(\d+)\s*degrees", re.I)
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_RE = re.compile(r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+(\d{1,2})", re.I)
+_TOMORROW_RE = re.compile(r"tomorrow", re.I)
+_TODAY_RE = re.compile(r"today", re.I)
+_MM_RE = re.compile(r"([\d.]+)\s*(?:mm|millimeters?)", re.I)
+_INCH_RE = re.compile(r"([\d.]+)\s*inch", re.I)
+
+
+# Amount-vs-threshold step curves: multiples of the threshold exceeded
+# (highest first), the probability for each, and the floor below them all
+_PRECIP_RATIOS, _PRECIP_PROBS, _PRECIP_FLOOR = (1.5, 1.0, 0.5), (0.85, 0.65, 0.35), 0.15
+_SNOW_RATIOS, _SNOW_PROBS, _SNOW_FLOOR = (1.5, 1.0, 0.3), (0.85, 0.60, 0.30), 0.10
+
+
+def _temp_curve(extreme, threshold):
+    """
+    Probability the forecast extreme (°C) exceeds a threshold: 0.90 if it's
+    more than 2° over, 0.10 if 2° or more under, and 0.5 + 0.1/° in between.
+    Pass negated min and threshold for "below" markets. Elementwise.
+    """
+    extreme = np.asarray(extreme, dtype=np.float64)
+    threshold = np.asarray(threshold, dtype=np.float64)
+    return np.select([extreme > threshold + 2, extreme > threshold - 2],
+                     [0.90, 0.5 + (extreme - threshold) / 2 * 0.2], 0.10)
+
+
+def _step_curve(amount, threshold, ratios, probs, floor):
+    """Probability an amount clears a threshold, per a step curve above. Elementwise."""
+    amount = np.asarray(amount, dtype=np.float64)
+    threshold = np.asarray(threshold, dtype=np.float64)
+    return np.select([amount > threshold * r for r in ratios], probs, floor)
+
+
+@njit(cache=True, fastmath=True)
+def _agg_precip(prob, mm):
+    """
+    Max and mean of hourly precipitation probability plus total amount,
+    in one fused pass. Returns (max_prob, total_mm, avg_prob).
+    """
+    max_p = 0.0
+    total_mm = 0.0
+    sum_p = 0.0
+    n = prob.shape[0]
+    for i in range(n):
+        p = np.float64(prob[i])
+        total_mm += np.float64(mm[i])
+        sum_p += p
+        if p > max_p:
+            max_p = p
+    return max_p, total_mm, sum_p / n
+
+
+# Default for the analyzers' `forecast` argument: fetch it here. A batch
+# passes None for a failed fetch, which must skip the market, not refetch.
+_FETCH = object()
+
+
+def _clip_prob(p: float) -> float:
+    """Clamp a scalar probability to [0.05, 0.95] without NumPy's per-call overhead."""
+    return 0.05 if p < 0.05 else 0.95 if p > 0.95 else p
+
+
+def _day_mask(times: np.ndarray, target_date: datetime) -> np.ndarray:
+    """Mask of the datetime64[h] forecast hours that fall on target_date's UTC day."""
+    day_start = np.datetime64(target_date.date(), "h")
+    return (times >= day_start) & (times < day_start + np.timedelta64(24, "h"))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class WeatherSignal:
     """Result of weather analysis for a specific market."""
     market_id: str
@@ -47,35 +146,156 @@ class WeatherStrategy:
 
     def analyze_market(self, market: dict, market_probability: float) -> Optional[WeatherSignal]:
         """Analyze a weather market and return a signal if we find edge."""
+        located = self._locate(market)
+        if located is None:
+            return None
+        market_type, lat, lon = located
+        now = datetime.now(timezone.utc)
+
+        if market_type == "temperature":
+            return self._analyze_temperature_market(market, market_probability, lat, lon, now)
+        elif market_type == "precipitation":
+            return self._analyze_precipitation_market(market, market_probability, lat, lon, now)
+        else:  # "snow"
+            return self._analyze_snow_market(market, market_probability, lat, lon, now)
+
+    def analyze_markets(self, markets: list, market_probs) -> list[WeatherSignal]:
+        """
+        Analyze a batch of markets and return the signals whose |edge| clears
+        MIN_EDGE_THRESHOLD, in market order. Each forecast is fetched once per
+        location for the whole batch, concurrently, and all temperature markets
+        are scored in one vectorized curve evaluation.
+
+        With openmeteo_requests installed the forecasts come from FlatBuffers
+        on a thread pool; otherwise from JSON over aiohttp (or threads).
+        """
+        if HAS_AIOHTTP and not HAS_OPENMETEO:
+            return asyncio.run(self.analyze_markets_async(markets, market_probs))
+        located = self._locate_all(markets)
+        keys = list(set(located) - {None})
+        forecasts = {}
+        if keys:
+            with ThreadPoolExecutor(max_workers=min(config.SCAN_MAX_WORKERS, len(keys))) as ex:
+                forecasts = dict(zip(keys, ex.map(lambda key: self._fetch_forecast(*key), keys)))
+        return self._score_markets(markets, market_probs, located, forecasts)
+
+    async def analyze_markets_async(self, markets: list, market_probs) -> list[WeatherSignal]:
+        """analyze_markets for callers already inside an event loop (requires aiohttp)."""
+        located = self._locate_all(markets)
+        keys = list(set(located) - {None})
+        async with self.feed.aio_session() as session:
+            results = await asyncio.gather(*(self._afetch_forecast(*key, session) for key in keys))
+        return self._score_markets(markets, market_probs, located, dict(zip(keys, results)))
+
+    def _fetch_forecast(self, market_type: str, lat: float, lon: float):
+        """The forecast a market type is scored against."""
+        if market_type == "temperature":
+            return self.feed.get_temperature_forecast(lat, lon, hours_ahead=72)
+        if market_type == "precipitation":
+            return self.feed.get_precipitation_forecast(lat, lon, hours_ahead=72)
+        return self.feed.get_snowfall_forecast(lat, lon, hours_ahead=72)
+
+    async def _afetch_forecast(self, market_type: str, lat: float, lon: float, session):
+        """Async _fetch_forecast over a shared aiohttp session."""
+        if market_type == "temperature":
+            return await self.feed.aget_temperature_forecast(lat, lon, 72, session)
+        if market_type == "precipitation":
+            return await self.feed.aget_precipitation_forecast(lat, lon, 72, session)
+        return await self.feed.aget_snowfall_forecast(lat, lon, 72, session)
+
+    def _score_markets(self, markets: list, market_probs, located: list,
+                       forecasts: dict) -> list[WeatherSignal]:
+        """
+        Score located markets against already-fetched forecasts (see
+        analyze_markets). A market that raises is logged and skipped.
+        """
+        now = datetime.now(timezone.utc)
+        signals = []     # (market index, signal)
+        temp_rows = []   # (market index, market prob, temp_f, above?, window temps, max, min)
+        for i, market in enumerate(markets):
+            if located[i] is None:
+                continue
+            try:
+                market_type, lat, lon = located[i]
+                forecast = forecasts[located[i]]
+                market_prob = float(market_probs[i])
+                if market_type == "temperature":
+                    temp_f, direction = self._parse_temperature(market.get("question", ""))
+                    if temp_f is None:
+                        continue
+                    temps = self._temperature_window(market.get("question", ""), forecast, now)
+                    if temps is not None:
+                        temp_rows.append((i, market_prob, temp_f, direction != "below", temps,
+                                          float(temps.max()), float(temps.min())))
+                    continue
+                analyze = (self._analyze_precipitation_market if market_type == "precipitation"
+                           else self._analyze_snow_market)
+                signal = analyze(market, market_prob, lat, lon, now, forecast=forecast)
+                if signal is not None and abs(signal.edge) >= config.MIN_EDGE_THRESHOLD:
+                    signals.append((i, signal))
+            except Exception as e:
+                logger.error("Error analyzing weather market %s: %s", market.get("id", ""), e)
+
+        if temp_rows:
+            idx, probs, temp_f, above, temps, max_temps, min_temps = zip(*temp_rows)
+            probs = np.array(probs)
+            above = np.array(above)
+            temp_c = (np.array(temp_f) - 32) * 5 / 9
+            max_temps = np.array(max_temps)
+            min_temps = np.array(min_temps)
+            our_probs = _temp_curve(np.where(above, max_temps, -min_temps),
+                                    np.where(above, temp_c, -temp_c))
+            keep = np.abs(our_probs - probs) >= config.MIN_EDGE_THRESHOLD
+            for j in np.flatnonzero(keep):
+                market = markets[idx[j]]
+                try:
+                    signals.append((idx[j], self._temperature_signal(
+                        market, float(our_probs[j]), float(probs[j]),
+                        temp_f[j], float(temp_c[j]), temps[j],
+                        float(max_temps[j]), float(min_temps[j]),
+                    )))
+                except Exception as e:
+                    logger.error("Error analyzing weather market %s: %s", market.get("id", ""), e)
+
+        signals.sort(key=lambda pair: pair[0])
+        return [signal for _, signal in signals]
+
+    def _locate_all(self, markets: list) -> list:
+        """_locate each market; one that raises is logged and treated as unanalyzable."""
+        located = []
+        for market in markets:
+            try:
+                located.append(self._locate(market))
+            except Exception as e:
+                logger.error("Error analyzing weather market %s: %s", market.get("id", ""), e)
+                located.append(None)
+        return located
+
+    def _locate(self, market: dict) -> Optional[tuple[str, float, float]]:
+        """(market_type, lat, lon) for a market we can analyze, else None."""
         question = market.get("question", "")
         description = market.get("description", "")
         full_text = f"{question} {description}"
 
+        # Cheap keyword screen before classification and the city lookup
+        if not _WEATHER_KEYWORDS_RE.search(full_text):
+            logger.debug("No analyzable weather type for: %s", question)
+            return None
+        market_type = self._classify_market(full_text)
+
         # Identify location
         coords = find_city_coords(full_text)
         if coords is None:
-            logger.debug(f"Could not identify location for: {question}")
+            logger.debug("Could not identify location for: %s", question)
             return None
 
-        lat, lon = coords
-
-        # Classify market type and analyze
-        market_type = self._classify_market(full_text)
-
-        if market_type == "temperature":
-            return self._analyze_temperature_market(market, market_probability, lat, lon)
-        elif market_type == "precipitation":
-            return self._analyze_precipitation_market(market, market_probability, lat, lon)
-        elif market_type == "snow":
-            return self._analyze_snow_market(market, market_probability, lat, lon)
-        else:
-            logger.debug(f"Unhandled weather market type '{market_type}': {question}")
-            return None
+        return market_type, coords[0], coords[1]
 
     # ── Temperature Markets ──────────────────────────────────
 
     def _analyze_temperature_market(self, market: dict, market_prob: float,
-                                     lat: float, lon: float) -> Optional[WeatherSignal]:
+                                     lat: float, lon: float,
+                                     now: datetime) -> Optional[WeatherSignal]:
         """Analyze temperature threshold markets (e.g., 'Will NYC hit 90°F?')."""
         question = market.get("question", "")
 
@@ -86,57 +306,46 @@ class WeatherStrategy:
 
         temp_c = (temp_f - 32) * 5 / 9  # Convert to Celsius for Open-Meteo
 
-        # Get forecast
+        # Get forecast, filtered to the relevant time window
         forecast = self.feed.get_temperature_forecast(lat, lon, hours_ahead=72)
-        if not forecast:
-            return None
-
-        # Parse target date from question
-        target_date = self._parse_target_date(question)
-
-        # Filter forecast to relevant time window
-        if target_date:
-            relevant = [
-                (t, temp) for t, temp in forecast
-                if target_date.strftime("%Y-%m-%d") in t
-            ]
-        else:
-            relevant = forecast[:48]  # Default: next 48 hours
-
-        if not relevant:
+        temps = self._temperature_window(question, forecast, now)
+        if temps is None:
             return None
 
         # Calculate probability from forecast
-        temps = [temp for _, temp in relevant]
-        max_temp = max(temps)
-        min_temp = min(temps)
-        avg_temp = np.mean(temps)
+        max_temp = float(temps.max())
+        min_temp = float(temps.min())
 
         if direction == "above" or direction == "hit":
             # Will temperature exceed threshold?
-            if max_temp > temp_c + 2:
-                our_prob = 0.90
-            elif max_temp > temp_c:
-                # Close — use distance-based probability
-                margin = (max_temp - temp_c) / 2
-                our_prob = 0.5 + min(margin * 0.2, 0.4)
-            elif max_temp > temp_c - 2:
-                margin = (temp_c - max_temp) / 2
-                our_prob = 0.5 - min(margin * 0.2, 0.4)
-            else:
-                our_prob = 0.10
+            our_prob = float(_temp_curve(max_temp, temp_c))
         else:  # "below"
-            if min_temp < temp_c - 2:
-                our_prob = 0.90
-            elif min_temp < temp_c:
-                margin = (temp_c - min_temp) / 2
-                our_prob = 0.5 + min(margin * 0.2, 0.4)
-            elif min_temp < temp_c + 2:
-                margin = (min_temp - temp_c) / 2
-                our_prob = 0.5 - min(margin * 0.2, 0.4)
-            else:
-                our_prob = 0.10
+            our_prob = float(_temp_curve(-min_temp, -temp_c))
+
+        return self._temperature_signal(market, our_prob, market_prob,
+                                        temp_f, temp_c, temps, max_temp, min_temp)
 
+    def _temperature_window(self, question: str, forecast,
+                            now: datetime) -> Optional[np.ndarray]:
+        """Forecast temperatures for the question's target day (default: next 48h), or None."""
+        if forecast is None or not forecast.times.size:
+            return None
+
+        # Parse target date from question
+        target_date = self._parse_target_date(question, now)
+
+        if target_date:
+            temps = forecast.temps_c[_day_mask(forecast.times, target_date)]
+        else:
+            temps = forecast.temps_c[:48]  # Default: next 48 hours
+
+        return temps if temps.size else None
+
+    def _temperature_signal(self, market: dict, our_prob: float, market_prob: float,
+                            temp_f: float, temp_c: float, temps: np.ndarray,
+                            max_temp: float, min_temp: float) -> WeatherSignal:
+        """Build the signal for a scored temperature market."""
+        question = market.get("question", "")
         edge = our_prob - market_prob
         recommended_side = "YES" if edge > 0 else "NO"
         if recommended_side == "NO":
@@ -170,50 +379,44 @@ class WeatherStrategy:
     # ── Precipitation Markets ────────────────────────────────
 
     def _analyze_precipitation_market(self, market: dict, market_prob: float,
-                                       lat: float, lon: float) -> Optional[WeatherSignal]:
+                                       lat: float, lon: float, now: datetime,
+                                       forecast=_FETCH) -> Optional[WeatherSignal]:
         """Analyze rain/precipitation markets."""
         question = market.get("question", "")
 
-        forecast = self.feed.get_precipitation_forecast(lat, lon, hours_ahead=72)
-        if not forecast:
+        if forecast is _FETCH:
+            forecast = self.feed.get_precipitation_forecast(lat, lon, hours_ahead=72)
+        if forecast is None or not forecast.times.size:
             return None
 
-        target_date = self._parse_target_date(question)
+        target_date = self._parse_target_date(question, now)
 
         if target_date:
-            relevant = [
-                f for f in forecast
-                if target_date.strftime("%Y-%m-%d") in f["time"]
-            ]
+            mask = _day_mask(forecast.times, target_date)
+            probs, amounts = forecast.probability[mask], forecast.amount_mm[mask]
         else:
-            relevant = forecast[:48]
+            probs, amounts = forecast.probability[:48], forecast.amount_mm[:48]
 
-        if not relevant:
+        if not probs.size:
             return None
 
         # Will it rain? Look at precipitation probability
-        max_precip_prob = max(f["probability"] for f in relevant) / 100.0
-        total_precip = sum(f["amount_mm"] for f in relevant)
-        avg_precip_prob = np.mean([f["probability"] for f in relevant]) / 100.0
+        max_precip_prob, total_precip, avg_precip_prob = _agg_precip(probs, amounts)
+        max_precip_prob /= 100.0
+        avg_precip_prob /= 100.0
 
         # Parse if market asks about rain amount or just occurrence
         threshold_mm = self._parse_precipitation_threshold(question)
 
         if threshold_mm:
             # Market asks about specific amount
-            if total_precip > threshold_mm * 1.5:
-                our_prob = 0.85
-            elif total_precip > threshold_mm:
-                our_prob = 0.65
-            elif total_precip > threshold_mm * 0.5:
-                our_prob = 0.35
-            else:
-                our_prob = 0.15
+            our_prob = float(_step_curve(total_precip, threshold_mm,
+                                         _PRECIP_RATIOS, _PRECIP_PROBS, _PRECIP_FLOOR))
         else:
             # Market asks "will it rain?"
             our_prob = max_precip_prob * 0.7 + avg_precip_prob * 0.3
 
-        our_prob = float(np.clip(our_prob, 0.05, 0.95))
+        our_prob = _clip_prob(our_prob)
         edge = our_prob - market_prob
         recommended_side = "YES" if edge > 0 else "NO"
         if recommended_side == "NO":
@@ -246,48 +449,35 @@ class WeatherStrategy:
     # ── Snow Markets ─────────────────────────────────────────
 
     def _analyze_snow_market(self, market: dict, market_prob: float,
-                              lat: float, lon: float) -> Optional[WeatherSignal]:
+                              lat: float, lon: float, now: datetime,
+                              forecast=_FETCH) -> Optional[WeatherSignal]:
         """Analyze snowfall markets."""
         question = market.get("question", "")
 
-        forecast = self.feed.get_forecast(lat, lon)
-        if not forecast or "hourly" not in forecast:
-            return None
-
-        snowfall = forecast["hourly"].get("snowfall", [])
-        if not snowfall:
+        if forecast is _FETCH:
+            forecast = self.feed.get_snowfall_forecast(lat, lon, hours_ahead=72)
+        if forecast is None or not forecast.times.size:
             return None
 
-        target_date = self._parse_target_date(question)
-        times = forecast["hourly"].get("time", [])
+        target_date = self._parse_target_date(question, now)
 
         if target_date:
-            relevant_snow = [
-                s for t, s in zip(times, snowfall)
-                if target_date.strftime("%Y-%m-%d") in t
-            ]
+            relevant_snow = forecast.snowfall_cm[_day_mask(forecast.times, target_date)]
         else:
-            relevant_snow = snowfall[:48]
+            relevant_snow = forecast.snowfall_cm[:48]
 
-        total_snow_cm = sum(relevant_snow)
-        max_hourly = max(relevant_snow) if relevant_snow else 0
+        total_snow_cm = float(relevant_snow.sum())
 
         # Parse threshold
         snow_threshold = self._parse_snow_threshold(question)
         if snow_threshold:
             threshold_cm = snow_threshold * 2.54  # inches to cm
-            if total_snow_cm > threshold_cm * 1.5:
-                our_prob = 0.85
-            elif total_snow_cm > threshold_cm:
-                our_prob = 0.60
-            elif total_snow_cm > threshold_cm * 0.3:
-                our_prob = 0.30
-            else:
-                our_prob = 0.10
+            our_prob = float(_step_curve(total_snow_cm, threshold_cm,
+                                         _SNOW_RATIOS, _SNOW_PROBS, _SNOW_FLOOR))
         else:
             our_prob = min(0.90, total_snow_cm / 5.0) if total_snow_cm > 0.5 else 0.10
 
-        our_prob = float(np.clip(our_prob, 0.05, 0.95))
+        our_prob = _clip_prob(our_prob)
         edge = our_prob - market_prob
         recommended_side = "YES" if edge > 0 else "NO"
         if recommended_side == "NO":
@@ -318,84 +508,76 @@ class WeatherStrategy:
 
     # ── Parsing Helpers ──────────────────────────────────────
 
+    # Pure functions of the market text, and markets repeat every scan, so the
+    # text parsers are memoized. _parse_target_date is not: it depends on `now`.
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _classify_market(text: str) -> str:
-        text_lower = text.lower()
-        if any(w in text_lower for w in ["temperature", "degrees", "°f", "°c", "hot", "cold", "heat", "freeze"]):
-            return "temperature"
-        if any(w in text_lower for w in ["rain", "precipitation", "rainfall", "shower"]):
-            return "precipitation"
-        if any(w in text_lower for w in ["snow", "snowfall", "blizzard", "ice storm"]):
-            return "snow"
-        if any(w in text_lower for w in ["hurricane", "typhoon", "cyclone"]):
-            return "storm"
-        if any(w in text_lower for w in ["tornado", "twister"]):
-            return "tornado"
-        if any(w in text_lower for w in ["wind", "gust"]):
-            return "wind"
+        for pattern, market_type in _CLASSIFIER_PATTERNS:
+            if pattern.search(text):
+                return market_type
         return "unknown"
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _parse_temperature(question: str) -> tuple[Optional[float], Optional[str]]:
         """Parse temperature and direction from question."""
-        question_lower = question.lower()
         direction = None
-        if any(w in question_lower for w in ["above", "over", "exceed", "hit", "reach"]):
+        if _ABOVE_RE.search(question):
             direction = "above"
-        elif any(w in question_lower for w in ["below", "under", "drop"]):
+        elif _BELOW_RE.search(question):
             direction = "below"
         if direction is None:
             direction = "hit"
 
-        match = re.search(r'(\d+)\s*°?\s*[fF]', question)
+        match = _TEMP_F_RE.search(question)
         if match:
             return float(match.group(1)), direction
 
-        match = re.search(r'(\d+)\s*degrees', question_lower)
+        match = _TEMP_DEGREES_RE.search(question)
         if match:
             return float(match.group(1)), direction
 
         return None, None
 
     @staticmethod
-    def _parse_target_date(question: str) -> Optional[datetime]:
-        """Try to extract a target date from the question."""
-        months = {
-            "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
-            "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
-        }
-        match = re.search(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+(\d{1,2})', question.lower())
+    def _parse_target_date(question: str, now: datetime) -> Optional[datetime]:
+        """Try to extract a target date from the question, relative to UTC `now`."""
+        match = _MONTH_RE.search(question)
         if match:
-            month = months[match.group(1)[:3]]
+            month = _MONTHS[match.group(1).lower()]
             day = int(match.group(2))
-            year = datetime.now().year
+            year = now.year
             try:
                 return datetime(year, month, day, tzinfo=timezone.utc)
             except ValueError:
                 pass
 
-        if "tomorrow" in question.lower():
-            return datetime.now(timezone.utc) + timedelta(days=1)
-        if "today" in question.lower():
-            return datetime.now(timezone.utc)
+        if _TOMORROW_RE.search(question):
+            return now + timedelta(days=1)
+        if _TODAY_RE.search(question):
+            return now
 
         return None
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _parse_precipitation_threshold(question: str) -> Optional[float]:
         """Parse precipitation threshold in mm."""
-        match = re.search(r'([\d.]+)\s*(?:mm|millimeters?)', question.lower())
+        match = _MM_RE.search(question)
         if match:
             return float(match.group(1))
-        match = re.search(r'([\d.]+)\s*inch', question.lower())
+        match = _INCH_RE.search(question)
         if match:
             return float(match.group(1)) * 25.4
         return None
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _parse_snow_threshold(question: str) -> Optional[float]:
         """Parse snow threshold in inches."""
-        match = re.search(r'([\d.]+)\s*inch', question.lower())
+        match = _INCH_RE.search(question)
         if match:
             return float(match.group(1))
         return None
@@ -403,13 +585,9 @@ class WeatherStrategy:
     @staticmethod
     def _get_token_ids(market: dict) -> list:
         """Extract CLOB token IDs from market."""
-        import json
         token_ids = market.get("clobTokenIds", "")
         if isinstance(token_ids, str) and token_ids:
-            try:
-                return json.loads(token_ids)
-            except Exception:
-                pass
+            return parse_token_ids(token_ids)
         if isinstance(token_ids, list):
             return token_ids
         return []